@@ -2,6 +2,18 @@
 """
 ai_commit – suggest git commit messages using local LLM.
 Supports auto-staging, direct commit, pushing to origin, and regeneration.
+
+Flags:
+  --all       use the full working tree diff (git diff HEAD)
+  --no-cache  ignore the cached suggestion for an unchanged diff (~/.cache/ai-tools/llm.db)
+
+Ollama tuning:
+  AI_COMMIT_KEEP_ALIVE      how long the model stays loaded after a call (default 1h),
+                            so back-to-back commits skip the model reload
+  AI_COMMIT_PARAPHRASE_MODEL
+                            smaller model for "Paraphrase Summary" (default: the commit model)
+  OLLAMA_NUM_PARALLEL       (server) >= 2 lets the background prefetch run alongside other calls
+  OLLAMA_MAX_LOADED_MODELS  (server) keep the commit model loaded next to other tools' models
 """
 from __future__ import annotations
 
@@ -9,27 +21,66 @@ import os
 import sys
 import subprocess
 import re
+import shlex
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
 from textwrap import dedent
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
 
 from pydantic import BaseModel, Field, AliasChoices
 
 # Relative imports
-from .helper.env import load_repo_dotenv
-from .helper.llm import ollama_chat
+from .helper.env import load_repo_dotenv, env_bool, env_int
+from .helper.llm import ollama_generate, warm_model, resolve_model
 from .helper.spinner import with_spinner
 from .helper.clipboard import copy_to_clipboard
+from .helper.keys import read_key
 from .helper.colors import Colors
 from .helper.json_utils import safe_parse_model
+from .helper import llm_cache
+from .helper.context import fit_num_ctx
 from .helper.git import (
-    run_git_cmd,
+    git_status,
     push_with_upstream_if_needed,
     get_git_diff,
+    analyze_diff,
+    compact_diff,
 )
 
 load_repo_dotenv()
 
+T = TypeVar("T")
+
+# Meta preambles some models put in front of the summary line
+_META_PREFIX_RE = re.compile(
+    r"^\s*(?:here(?:'s| is)(?: a| the)?(?: suitable)? commit message:?|"
+    r"suggested commit message:?|commit message:|summary:)\s*",
+    re.IGNORECASE,
+)
+_SUMMARY_QUOTES = "\"'` "
+
+# Diffs are read only up to this size (whole files kept where possible)
+MAX_DIFF_CHARS = env_int("AI_COMMIT_MAX_DIFF_CHARS", 12000)
+# Lines kept per file, so one huge file does not crowd out the others
+MAX_FILE_LINES = env_int("AI_COMMIT_MAX_FILE_LINES", 200)
+
+# Noise kept out of the prompt (colon-separated git pathspec patterns)
+DEFAULT_EXCLUDE = "*.lock:*package-lock.json:*.min.js:*.min.css:*node_modules/*"
+EXCLUDE_PATHS = [p for p in os.getenv("AI_COMMIT_EXCLUDE", DEFAULT_EXCLUDE).split(":") if p.strip()]
+
+# Optional smaller model for one-line paraphrases (falls back to the commit model)
+PARAPHRASE_MODEL = os.getenv("AI_COMMIT_PARAPHRASE_MODEL") or None
+
+# Upper bound for the generated commit JSON, in tokens
+MAX_RESPONSE_TOKENS = 1024
+
+# Regenerations raise the temperature step by step, up to this value
+MAX_RETRY_TEMPERATURE = 0.8
+
+# Raw model answers cached per (prompt, model, options); entries expire after a day
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
 # -----------------------------------------------------------------------------
 # Config & Types
 # -----------------------------------------------------------------------------
@@ -44,6 +95,10 @@ class CommitData(BaseModel):
         description="A short imperative summary line (< 50 chars preferred).",
     )
     bullets: List[CommitFile] = Field(default_factory=list)
+    # Extra summary candidates from the same generation (used by "Paraphrase")
+    alternatives: List[str] = Field(default_factory=list)
+    # Changed files the model wrote no bullet for (filled in locally, not by the model)
+    missing_files: List[str] = Field(default_factory=list)
     
     # Fallback for display if something goes wrong but we have partial data
     raw_output: str = ""
@@ -56,67 +111,236 @@ class CommitCfg:
     timeout: int = 120
     temperature: float = 0.2
     cwd: str = os.environ.get("USER_PWD", os.getcwd())
+    keep_alive: str = os.getenv("AI_COMMIT_KEEP_ALIVE", "1h")
 
 # -----------------------------------------------------------------------------
 # LLM Execution
 # -----------------------------------------------------------------------------
 
-def generate_commit(diff: str, cfg: CommitCfg) -> CommitData:
-    system = dedent("""
-        You are an expert developer writing git commit messages.
-        
-        Rules:
-        1. "summary": strictly < 72 chars, imperative mood (e.g., "Add feature" not "Added feature").
-        2. "bullets": list of changed files with brief explanations.
-        3. Output MUST be valid JSON.
-        
-        Schema:
-        {
-          "summary": "string",
-          "bullets": [
-            { "path": "string", "explanation": "string" }
-          ]
-        }
-    """).strip()
-
+_SYSTEM_PROMPT = dedent("""
+    You are an expert developer writing git commit messages.
+    
+    Rules:
+    1. "summary": strictly < 72 chars, imperative mood (e.g., "Add feature" not "Added feature").
+    2. "bullets": list of changed files with brief explanations.
+    3. "alternatives": 2 more summary lines for the same change, worded differently (same rules as "summary").
+    4. No meta text anywhere: never write "Here is the commit message", "Summary:",
+       "Commit message:" or similar, and no markdown, quotes or trailing period in "summary".
+    5. Output MUST be valid JSON.
+    
+    Schema:
+    {
+      "summary": "string",
+      "bullets": [
+        { "path": "string", "explanation": "string" }
+      ],
+      "alternatives": ["string", "string"]
+    }
+""").strip()
+
+
+# Paraphrase only sees the summary: no diff, so the prompt stays a few dozen tokens
+_PARAPHRASE_PROMPT = dedent("""
+    You rewrite git commit summary lines.
+    Reply with ONE new summary for the same change: imperative mood, < 72 chars,
+    worded differently from the input. Output the line only, no quotes or preamble.
+""").strip()
+
+
+def generate_commit(diff: str, cfg: CommitCfg, use_cache: bool = False, variant: int = 0) -> CommitData:
+    """
+    Ask the model for a commit message. variant > 0 is a regeneration: it gets
+    its own seed and a slightly higher temperature so it does not repeat the
+    previous answer, while the prompt itself (and Ollama's cached prefix) is unchanged.
+    """
+    stats = analyze_diff(diff)
+    files_hint = ""
+    if stats.files:
+        new_files = set(stats.new_files)
+        files_hint = "Changed files:\n" + "\n".join(
+            f"- {path} (new file)" if path in new_files else f"- {path}" for path in stats.files
+        ) + "\n\n"
+
+    user = f"{files_hint}Generate commit for this diff:\n{diff}"
+
+    # Room for the summary, alternatives and one bullet per file; also caps
+    # decoding so a rambling model cannot run on until the timeout
+    max_tokens = min(MAX_RESPONSE_TOKENS, 192 + 48 * stats.file_count)
+    # cfg.num_ctx is the ceiling; small diffs get a smaller (faster) window
+    num_ctx = fit_num_ctx(_SYSTEM_PROMPT, user, response_tokens=max_tokens, max_ctx=cfg.num_ctx)
+
+    temperature = cfg.temperature
+    seed = None
+    if variant:
+        temperature = min(cfg.temperature + 0.2 * variant, MAX_RETRY_TEMPERATURE)
+        seed = variant
+
+    model = resolve_model(cfg.model)
+    key = llm_cache.cache_key("ai_commit", _SYSTEM_PROMPT, user, model, str(num_ctx), str(max_tokens), str(temperature), str(seed))
+    raw = llm_cache.lookup(key, max_age=CACHE_TTL_SECONDS) if use_cache else None
+    from_cache = raw is not None
+
+    if raw is None:
+        try:
+            raw = ollama_generate(
+                system_prompt=_SYSTEM_PROMPT,
+                user_prompt=user,
+                model=cfg.model,
+                num_ctx=num_ctx,
+                timeout=cfg.timeout,
+                temperature=temperature,
+                seed=seed,
+                num_predict=max_tokens,
+                format="json",
+                stream=True,
+                stop_after_json=True,
+                keep_alive=cfg.keep_alive,
+            )
+        except Exception as e:
+            return CommitData(summary="Error generating commit", bullets=[], raw_output=str(e), is_error=True)
+
+    commit = safe_parse_model(raw, CommitData, lambda r: CommitData(summary="Failed to parse JSON", bullets=[], raw_output=r, is_error=True))
+    if not commit.is_error:
+        commit.summary = _clean_summary(commit.summary)
+        alternatives = (_clean_summary(a) for a in commit.alternatives)
+        commit.alternatives = [a for a in alternatives if a and a != commit.summary]
+        covered = {b.path for b in commit.bullets}
+        commit.missing_files = [path for path in stats.files if path not in covered]
+        if not from_cache:
+            llm_cache.store(key, raw, model)
+    return commit
+
+
+def paraphrase_summary(summary: str, cfg: CommitCfg) -> Optional[str]:
+    """
+    Reword an existing summary with a short prompt (the diff is not re-sent).
+    Returns None if the model fails or only echoes the input.
+    """
     try:
-        raw = ollama_chat(
-            system_prompt=system,
-            user_prompt=f"Generate commit for this diff:\n{diff}",
-            model=cfg.model,
-            num_ctx=cfg.num_ctx,
+        raw = ollama_generate(
+            system_prompt=_PARAPHRASE_PROMPT,
+            user_prompt=summary,
+            model=PARAPHRASE_MODEL or cfg.model,
+            num_ctx=fit_num_ctx(_PARAPHRASE_PROMPT, summary, max_ctx=cfg.num_ctx),
             timeout=cfg.timeout,
-            temperature=cfg.temperature,
+            temperature=0.7,
+            keep_alive=cfg.keep_alive,
+            # One summary line: bound decoding and stop at the first newline
+            num_predict=40,
+            stop=["\n"],
         )
-    except Exception as e:
-        return CommitData(summary="Error generating commit", bullets=[], raw_output=str(e), is_error=True)
+    except Exception:
+        return None
+    lines = raw.strip().splitlines()
+    new_summary = _clean_summary(lines[0]) if lines else ""
+    if not new_summary or new_summary == summary:
+        return None
+    return new_summary
+
+
+def _clean_summary(summary: str) -> str:
+    """Drop meta preambles and wrapping quotes the model sometimes adds to the summary."""
+    return _META_PREFIX_RE.sub("", summary, count=1).strip(_SUMMARY_QUOTES)
+
 
-    return safe_parse_model(raw, CommitData, lambda r: CommitData(summary="Failed to parse JSON", bullets=[], raw_output=r, is_error=True))
+def _prefetch(fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """
+    Start fn(*args, **kwargs) on a daemon thread and return a Future for its result.
+    Daemon, so an unused prefetch never delays process exit.
+    """
+    fut: "Future[T]" = Future()
+
+    def _run() -> None:
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+
+    threading.Thread(target=_run, daemon=True).start()
+    return fut
 
 # -----------------------------------------------------------------------------
 # Main Execution Flow
 # -----------------------------------------------------------------------------
 
+# Menu text is the same every round, so it is colored once
+_MENU = "\n".join(
+    [f"{Colors.m('[ai_commit]')} Select action:"]
+    + [
+        f"  {Colors.b(f'{i})')} {label}"
+        for i, label in enumerate(
+            [
+                "Copy command to clipboard",
+                "Commit locally now",
+                "Commit and Push to origin",
+                "Paraphrase Summary (Short Retry)",
+                "Full Retry (Regenerate from diff)",
+                "Cancel",
+            ],
+            1,
+        )
+    ]
+)
+_MENU_PROMPT = f"\n{Colors.m('Selection [1-6] (default 1):')} "
+_SUMMARY_HEADER = Colors.b("► Proposed Summary:")
+_COMMAND_HEADER = Colors.y("► Generated Command:")
+_BULLET_DOT = Colors.grey("•")
+_RETRY_PROMPT = f"\n{Colors.m('Retry? [y/N/x] (x=double context):')} "
+_SPIN_ANALYZE = Colors.c("ai_commit analyzing changes")
+_SPIN_PARAPHRASE = Colors.c("ai_commit paraphrasing")
+
+
 def main() -> None:
     cfg = CommitCfg()
     use_all = "--all" in sys.argv
+    # Only the first suggestion may come from cache; retries must regenerate
+    use_cache = "--no-cache" not in sys.argv
+
+    prefetch_enabled = env_bool("AI_COMMIT_PREFETCH", "1")
+
+    # Load the model while git runs, so the first call skips the cold start
+    warm_model(cfg.model, keep_alive=cfg.keep_alive)
 
     # 1. Capture Diff once
-    diff = get_git_diff(use_all, cfg.cwd)
+    diff = compact_diff(get_git_diff(use_all, cfg.cwd, MAX_DIFF_CHARS, EXCLUDE_PATHS), MAX_FILE_LINES)
+
+    # Regeneration started while the user reads the menu (retry is then instant)
+    pending: Optional["Future[CommitData]"] = None
+    # Set when the next round only swaps in a pre-generated summary
+    reuse: Optional[CommitData] = None
+    # Number of generations so far; each regeneration samples a new variant
+    variant = 0
+    # Paraphrase of the shown summary, started once its alternatives are used up
+    pending_paraphrase: Optional[Tuple[str, "Future[Optional[str]]"]] = None
 
     while True:
         # 2. Generate Commit Message
-        commit_data = with_spinner(
-            Colors.c("ai_commit analyzing changes"),
-            lambda: generate_commit(diff, cfg),
-        )
+        if reuse is not None:
+            commit_data, reuse = reuse, None
+        elif pending is not None:
+            commit_data = with_spinner(
+                _SPIN_ANALYZE,
+                pending.result,
+            )
+            pending = None
+            variant += 1
+        else:
+            commit_data = with_spinner(
+                _SPIN_ANALYZE,
+                generate_commit, diff, cfg, use_cache, variant,
+            )
+            use_cache = False
+            variant += 1
         
         if commit_data.is_error:
             print(f"\n{Colors.r('✗ LLM Error:')}\n{commit_data.raw_output}")
             print(f"\n{Colors.y('Tip: Try staging fewer files or increasing context.')}")
 
             # Offer retry
-            retry_choice = input(f"\n{Colors.m('Retry? [y/N/x] (x=double context):')} ").lower().strip()
+            try:
+                retry_choice = read_key(_RETRY_PROMPT).lower()
+            except KeyboardInterrupt:
+                retry_choice = ""
             if retry_choice == 'y':
                 continue
             if retry_choice == 'x':
@@ -125,43 +349,54 @@ def main() -> None:
                     num_ctx=cfg.num_ctx * 2,
                     timeout=cfg.timeout,
                     temperature=cfg.temperature,
-                    cwd=cfg.cwd
+                    cwd=cfg.cwd,
+                    keep_alive=cfg.keep_alive,
                 )
                 print(f"{Colors.y(f'Context increased to {cfg.num_ctx}. Retrying...')}")
                 continue
 
             sys.exit(1)
 
-        # 3. Prepare Commit Arguments
-        summary_esc = commit_data.summary.replace('"', '\\"')
-        git_args = ["commit", "-m", summary_esc]
+        # 3. Prepare Commit Arguments (passed to git as-is, no shell involved)
+        #    One pass over the bullets builds the git args, the pretty rows and
+        #    the copyable command together.
+        git_args = ["commit", "-m", commit_data.summary]
+        pretty_rows: List[str] = []
+        # shlex.quote makes the shown/copied command safe to paste ($, `, ", ...)
+        cmd_lines = [f"git commit -m {shlex.quote(commit_data.summary)}"]
         for b in commit_data.bullets:
-            bullet_text = f"- {b.path}: {b.explanation}".replace('"', '\\"')
-            git_args += ["-m", bullet_text]
+            line = f"- {b.path}: {b.explanation}"
+            git_args += ["-m", line]
+            pretty_rows.append(f"  {_BULLET_DOT} {Colors.g(b.path)}: {b.explanation}")
+            cmd_lines.append(f"-m {shlex.quote(line)}")
 
         # 4. Visual Presentation
-        print(f"\n{Colors.b('► Proposed Summary:')} {Colors.bold(commit_data.summary)}")
-        for b in commit_data.bullets:
-            print(f"  {Colors.grey('•')} {Colors.g(b.path)}: {b.explanation}")
+        print("\n".join([f"\n{_SUMMARY_HEADER} {Colors.bold(commit_data.summary)}", *pretty_rows]))
+        if commit_data.missing_files:
+            print(Colors.grey(f"  (no bullet for: {', '.join(commit_data.missing_files)})"))
 
-        cmd_display = "git commit"
-        cmd_display += f' -m "{summary_esc}"'
-        for b in commit_data.bullets:
-            cmd_display += f' \\\n  -m "- {b.path}: {b.explanation}"'
+        cmd_display = " \\\n  ".join(cmd_lines)
 
-        print(f"\n{Colors.y('► Generated Command:')}\n{cmd_display}\n")
+        print(f"\n{_COMMAND_HEADER}\n{cmd_display}\n")
 
         # 5. Menu
-        print(f"{Colors.m('[ai_commit]')} Select action:")
-        print(f"  {Colors.b('1)')} Copy command to clipboard")
-        print(f"  {Colors.b('2)')} Commit locally now")
-        print(f"  {Colors.b('3)')} Commit and Push to origin")
-        print(f"  {Colors.b('4)')} Paraphrase Summary (Short Retry)")
-        print(f"  {Colors.b('5)')} Full Retry (Regenerate from diff)")
-        print(f"  {Colors.b('6)')} Cancel")
+        print(_MENU)
+
+        if prefetch_enabled:
+            if pending is None:
+                pending = _prefetch(generate_commit, diff, cfg, variant=variant)
+            # Only a one-line call, so it can run next to the full regeneration
+            if not commit_data.alternatives and (
+                pending_paraphrase is None or pending_paraphrase[0] != commit_data.summary
+            ):
+                pending_paraphrase = (
+                    commit_data.summary,
+                    _prefetch(paraphrase_summary, commit_data.summary, cfg),
+                )
 
         try:
-            choice = input(f"\n{Colors.m('Selection [1-6] (default 1):')} ").strip()
+            # One key press selects; no Enter needed on a terminal
+            choice = read_key(_MENU_PROMPT)
         except KeyboardInterrupt:
             print(f"\n{Colors.grey('Cancelled.')}")
             sys.exit(0)
@@ -172,12 +407,31 @@ def main() -> None:
             continue  # Re-enters the loop to call LLM again
 
         if choice == "4":
-            print(Colors.grey("Retrying with variety..."))
+            if commit_data.alternatives:
+                # Candidates from the same generation: no model call needed
+                commit_data.summary = commit_data.alternatives.pop(0)
+                reuse = commit_data
+                continue
+            if pending_paraphrase is not None and pending_paraphrase[0] == commit_data.summary:
+                new_summary = with_spinner(
+                    _SPIN_PARAPHRASE,
+                    pending_paraphrase[1].result,
+                )
+            else:
+                new_summary = with_spinner(
+                    _SPIN_PARAPHRASE,
+                    paraphrase_summary, commit_data.summary, cfg,
+                )
+            pending_paraphrase = None
+            if new_summary:
+                commit_data.summary = new_summary
+                reuse = commit_data
+                continue
+            print(Colors.grey("Paraphrase failed, regenerating from diff..."))
             continue
 
         if choice in ("2", "3"):
-            staged_check = run_git_cmd(["diff", "--cached", "--name-only"], cfg.cwd)
-            if not staged_check.stdout.strip():
+            if not git_status(cfg.cwd).staged:
                 print(Colors.grey("No staged changes found. Auto-staging all changes..."))
                 subprocess.run(["git", "-C", cfg.cwd, "add", "."], check=True)
 
@@ -191,9 +445,9 @@ def main() -> None:
             break  # Exit loop after successful commit
 
         elif choice in ("", "1"):
-            success, backend = copy_to_clipboard(cmd_display.replace(" \\\n  ", " "))
-            if success:
-                print(Colors.g(f"✓ Copied to clipboard via {backend}."))
+            # Single-line form joined from the parts, not re-parsed from the display text.
+            # copy_to_clipboard reports success/failure itself.
+            copy_to_clipboard(" ".join(cmd_lines))
             break  # Exit loop after copy
 
         elif choice == "6":
@@ -1,18 +1,21 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from textwrap import dedent
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # IMPORTANT: relative imports (works when imported as scripts.english_teacher)
 from .helper.env import load_repo_dotenv
-from .helper.llm import ollama_chat
+from .helper.llm import ollama_chat, resolve_model
+from .helper import llm_cache
 from .helper.spinner import with_spinner
 from .helper.colors import Colors
 from .helper.json_utils import safe_parse_model
@@ -27,7 +30,10 @@ load_repo_dotenv()
 DEFAULT_MODEL = os.getenv("ENGLISH_TEACHER_MODEL")
 DEFAULT_NUM_CTX = int(os.getenv("ENGLISH_TEACHER_NUM_CTX", "4096"))
 DEFAULT_TIMEOUT = int(os.getenv("ENGLISH_TEACHER_TIMEOUT", "60"))
+_VALID_MODES = frozenset(("coach", "strict", "correct"))
 DEFAULT_MODE = os.getenv("ENGLISH_TEACHER_MODE", "coach")  # coach|strict|correct
+# Cap on generated tokens; a full answer is ~300, so this only stops runaways
+DEFAULT_MAX_TOKENS = int(os.getenv("ENGLISH_TEACHER_MAX_TOKENS", "768"))
 
 # Temperature for JSON tasks (lower = more deterministic)
 DEFAULT_TEMPERATURE = 0.3
@@ -39,18 +45,25 @@ DEFAULT_TOP_P = 0.9
 # -----------------------------------------------------------------------------
 
 class Mistake(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     frm: str
     to: str
     why: str
 
 
 class Pronunciation(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     word: str
     ipa: str
     cue: str
 
 
 class TeachOut(BaseModel):
+    # Whitespace is trimmed once while parsing, not again when printing
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     corrected_natural: str = ""
     corrected_literal: str = ""
     mistakes: List[Mistake] = Field(default_factory=list)
@@ -61,7 +74,7 @@ class TeachOut(BaseModel):
     raw_output: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TeachCfg:
     model: Optional[str] = DEFAULT_MODEL
     num_ctx: int = DEFAULT_NUM_CTX
@@ -69,130 +82,144 @@ class TeachCfg:
     mode: str = DEFAULT_MODE
     temperature: float = DEFAULT_TEMPERATURE
     top_p: float = DEFAULT_TOP_P
+    num_predict: int = DEFAULT_MAX_TOKENS
+
+
+# Shared by every call that does not override anything (frozen, so safe to reuse)
+_DEFAULT_CFG = TeachCfg()
 
 
 # -----------------------------------------------------------------------------
 # Prompting
 # -----------------------------------------------------------------------------
 
-def _build_system_prompt(mode: str) -> str:
-    base = dedent(
-        """
-        You are an English conversation coach for a non-native speaker.
-
-        Important context:
-        - The user's input is produced by a speech-to-text system.
-        - Treat punctuation and casing as unreliable artifacts of transcription.
-        - Focus on spoken English: wording, grammar, clarity, and natural phrasing.
-        - Do not nitpick punctuation/capitalization unless it changes the meaning.
-
-        Goals:
-        - Preserve the user's intended meaning.
-        - Correct grammar and wording with minimal changes.
-        - Highlight only the most important mistakes (avoid overwhelming the user).
-        - Provide pronunciation tips for words that are commonly mispronounced
-          OR likely to be mispronounced by learners. Use standard IPA notation.
-        - Use simple, intuitive pronunciation cues (e.g., "sounds like").
-
-        If the user's text is unclear:
-        - Make your best guess, but also ask a short clarifying question.
-
-        If the user's English is already perfect:
-        - Return empty lists for 'mistakes' and 'pronunciation'.
-        - Provide a brief, encouraging reply.
-
-        HARD CONSTRAINT:
-        - Output MUST be strict, valid JSON.
-        - No markdown, no code fences, no preambles, no trailing commentary.
-        """
-    ).strip()
-
-    if mode == "strict":
-        mode_block = dedent(
-            """
-            Mode: STRICT
-            - Be thorough: include repeated or small mistakes if they matter.
-            - Include pronunciation for any word that might be mispronounced.
-            - Provide concise rule-of-thumb if helpful.
-            """
-        ).strip()
-    elif mode == "correct":
-        mode_block = dedent(
-            """
-            Mode: CORRECT ONLY
-            - Do NOT continue the conversation or ask follow-up questions.
-            - Provide corrections only (leave 'reply' and 'follow_up_question' empty).
-            """
-        ).strip()
-    else:
-        mode_block = dedent(
-            """
-            Mode: COACH
-            - Continue the conversation naturally after corrections.
-            - Keep it practical, friendly, and not overly formal.
-            - Engage with follow-up questions.
-            """
-        ).strip()
-
-    # One-shot example (golden output)
-    example_input = "I has been working here for three years now and I love this job so much"
-    example_output = {
-        "corrected_natural": "I've been working here for three years now, and I love this job so much.",
-        "corrected_literal": "I have been working here for three years, and I love this job very much.",
-        "mistakes": [
-            {
-                "frm": "I has been",
-                "to": "I have been",
-                "why": "Subject-verb agreement: 'I' uses 'have', not 'has'."
-            }
-        ],
-        "pronunciation": [
-            {
-                "word": "working",
-                "ipa": "ˈwɜːrkɪŋ",
-                "cue": "WER-king (with a soft 'r' sound at the start)"
-            }
-        ],
-        "reply": "That's wonderful! Three years is a solid tenure. What aspect of the job brings you the most joy?",
-        "follow_up_question": "What's your favorite project you've worked on here?"
+# Fixed parts of the system prompt, dedented once at import
+_BASE_PROMPT = dedent(
+    """
+    You are an English conversation coach for a non-native speaker.
+
+    Important context:
+    - The user's input is produced by a speech-to-text system.
+    - Treat punctuation and casing as unreliable artifacts of transcription.
+    - Focus on spoken English: wording, grammar, clarity, and natural phrasing.
+    - Do not nitpick punctuation/capitalization unless it changes the meaning.
+
+    Goals:
+    - Preserve the user's intended meaning.
+    - Correct grammar and wording with minimal changes.
+    - Highlight only the most important mistakes (avoid overwhelming the user).
+    - Provide pronunciation tips for words that are commonly mispronounced
+      OR likely to be mispronounced by learners. Use standard IPA notation.
+    - Use simple, intuitive pronunciation cues (e.g., "sounds like").
+
+    If the user's text is unclear:
+    - Make your best guess, but also ask a short clarifying question.
+
+    If the user's English is already perfect:
+    - Return empty lists for 'mistakes' and 'pronunciation'.
+    - Provide a brief, encouraging reply.
+
+    HARD CONSTRAINT:
+    - Output MUST be strict, valid JSON.
+    - No markdown, no code fences, no preambles, no trailing commentary.
+    """
+).strip()
+
+_SCHEMA = dedent(
+    """
+    JSON Schema (exact keys required):
+    {
+      "corrected_natural": "string (how it sounds naturally)",
+      "corrected_literal": "string (word-for-word correction)",
+      "mistakes": [{"frm": "string", "to": "string", "why": "string"}],
+      "pronunciation": [{"word": "string", "ipa": "string (IPA notation)", "cue": "string (intuitive cue)"}],
+      "reply": "string (empty if mode is 'correct')",
+      "follow_up_question": "string (empty if mode is 'correct')"
     }
+    """
+).strip()
 
-    example_section = dedent(
-        f"""
-        Example Input:
-        "{example_input}"
 
-        Example Output (valid JSON):
-        {json.dumps(example_output, ensure_ascii=False, indent=2)}
+_MODE_BLOCKS = {
+    "strict": dedent(
         """
-    ).strip()
-
-    schema = dedent(
+        Mode: STRICT
+        - Be thorough: include repeated or small mistakes if they matter.
+        - Include pronunciation for any word that might be mispronounced.
+        - Provide concise rule-of-thumb if helpful.
+        """
+    ).strip(),
+    "correct": dedent(
+        """
+        Mode: CORRECT ONLY
+        - Do NOT continue the conversation or ask follow-up questions.
+        - Provide corrections only (leave 'reply' and 'follow_up_question' empty).
+        """
+    ).strip(),
+    "coach": dedent(
+        """
+        Mode: COACH
+        - Continue the conversation naturally after corrections.
+        - Keep it practical, friendly, and not overly formal.
+        - Engage with follow-up questions.
         """
-        JSON Schema (exact keys required):
+    ).strip(),
+}
+
+# One-shot example (golden output)
+_EXAMPLE_INPUT = "I has been working here for three years now and I love this job so much"
+_EXAMPLE_OUTPUT = {
+    "corrected_natural": "I've been working here for three years now, and I love this job so much.",
+    "corrected_literal": "I have been working here for three years, and I love this job very much.",
+    "mistakes": [
         {
-          "corrected_natural": "string (how it sounds naturally)",
-          "corrected_literal": "string (word-for-word correction)",
-          "mistakes": [{"frm": "string", "to": "string", "why": "string"}],
-          "pronunciation": [{"word": "string", "ipa": "string (IPA notation)", "cue": "string (intuitive cue)"}],
-          "reply": "string (empty if mode is 'correct')",
-          "follow_up_question": "string (empty if mode is 'correct')"
+            "frm": "I has been",
+            "to": "I have been",
+            "why": "Subject-verb agreement: 'I' uses 'have', not 'has'."
         }
+    ],
+    "pronunciation": [
+        {
+            "word": "working",
+            "ipa": "ˈwɜːrkɪŋ",
+            "cue": "WER-king (with a soft 'r' sound at the start)"
+        }
+    ],
+    "reply": "That's wonderful! Three years is a solid tenure. What aspect of the job brings you the most joy?",
+    "follow_up_question": "What's your favorite project you've worked on here?"
+}
+_EXAMPLE_JSON = json.dumps(_EXAMPLE_OUTPUT, ensure_ascii=False, indent=2)
+
+# The interpolated multi-line JSON leaves dedent nothing to strip, so the text
+# lines keep their indent; it is kept as-is so prompts (and cache keys) are unchanged
+_EXAMPLE_SECTION = dedent(
+    f"""
+        Example Input:
+        "{_EXAMPLE_INPUT}"
+
+        Example Output (valid JSON):
+        {_EXAMPLE_JSON}
         """
-    ).strip()
+).strip()
 
-    return f"{base}\n\n{mode_block}\n\n{example_section}\n\n{schema}"
 
+@lru_cache(maxsize=8)
+def _build_system_prompt(mode: str) -> str:
+    """System prompt for a mode (unknown modes get the coach block); built once per mode."""
+    mode_block = _MODE_BLOCKS.get(mode, _MODE_BLOCKS["coach"])
+    return f"{_BASE_PROMPT}\n\n{mode_block}\n\n{_EXAMPLE_SECTION}\n\n{_SCHEMA}"
 
-def _build_user_prompt(text: str) -> str:
-    return dedent(
-        f"""
-        User said (speech-to-text transcript):
-        {text}
 
-        Return strictly valid JSON matching the schema.
-        """
-    ).strip()
+_USER_TPL = (
+    "User said (speech-to-text transcript):\n"
+    "{text}\n"
+    "\n"
+    "Return strictly valid JSON matching the schema."
+)
+
+
+def _build_user_prompt(text: str) -> str:
+    return _USER_TPL.format(text=text)
 
 
 def _make_fallback_teachout(raw: str) -> TeachOut:
@@ -213,7 +240,12 @@ def _make_fallback_teachout(raw: str) -> TeachOut:
 # Public API (importable)
 # -----------------------------------------------------------------------------
 
-def teach(text: str, mode: str = DEFAULT_MODE, cfg: Optional[TeachCfg] = None) -> TeachOut:
+def teach(
+    text: str,
+    mode: str = DEFAULT_MODE,
+    cfg: Optional[TeachCfg] = None,
+    use_cache: bool = True,
+) -> TeachOut:
     """
     Core function for FastAPI and CLI usage.
 
@@ -221,32 +253,67 @@ def teach(text: str, mode: str = DEFAULT_MODE, cfg: Optional[TeachCfg] = None) -
         text: user utterance(s). You will likely pass combined transcripts.
         mode: coach|strict|correct
         cfg: optional configuration overrides (model/ctx/timeout/temperature/top_p).
+        use_cache: answer a repeated (text, mode, model, options) from the LLM cache;
+                   text is matched ignoring whitespace and case.
     """
-    if cfg is None:
-        cfg = TeachCfg(mode=mode)
-
-    if mode not in ("coach", "strict", "correct"):
+    # Validate first, so an unknown mode never ends up in a config either
+    if mode not in _VALID_MODES:
         mode = "coach"
 
+    if cfg is None:
+        cfg = _DEFAULT_CFG if mode == DEFAULT_MODE else TeachCfg(mode=mode)
+
+    # Transcripts differ in spacing between takes of the same sentence; collapse it
+    # before building the prompt so the cache key (the exact prompt sent) ignores it
+    text = " ".join(text.split())
     system_prompt = _build_system_prompt(mode)
     user_prompt = _build_user_prompt(text)
 
-    raw = ollama_chat(
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
-        model=cfg.model,
-        num_ctx=cfg.num_ctx,
-        timeout=cfg.timeout,
-        temperature=cfg.temperature,
-        top_p=cfg.top_p,
+    model = resolve_model(cfg.model)
+    key = llm_cache.cache_key(
+        "english_teacher", system_prompt, user_prompt, model,
+        str(cfg.num_ctx), str(cfg.temperature), str(cfg.top_p), str(cfg.num_predict),
     )
-    return safe_parse_model(raw, TeachOut, _make_fallback_teachout)
+    raw = llm_cache.lookup(key) if use_cache else None
+    from_cache = raw is not None
+
+    if raw is None:
+        raw = ollama_chat(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            model=cfg.model,
+            num_ctx=cfg.num_ctx,
+            timeout=cfg.timeout,
+            temperature=cfg.temperature,
+            top_p=cfg.top_p,
+            num_predict=cfg.num_predict,
+            # Stop reading once the answer object closes; anything the model
+            # adds after it would only cost decode time
+            stream=True,
+            stop_after_json=True,
+        )
+    out = safe_parse_model(raw, TeachOut, _make_fallback_teachout)
+    # Only answers that parsed are worth replaying
+    if not out.raw_error and not from_cache:
+        llm_cache.store(key, raw, model)
+    return out
 
 
 # -----------------------------------------------------------------------------
 # CLI formatting with rich colors
 # -----------------------------------------------------------------------------
 
+# Section headers are colored once at import
+# Header colors: 94=blue, 92=green, 91=red, 93=yellow
+_H_NATURAL = Colors.b("► Corrected (natural):")
+_H_LITERAL = Colors.b("► Corrected (literal):")
+_H_MISTAKES = Colors.r("⚠ Mistakes:")
+_H_PRONUNCIATION = Colors.y("🔊 Pronunciation:")
+_H_REPLY = Colors.g("💬 Reply:")
+_H_FOLLOW_UP = Colors.g("❓ Follow-up:")
+_MARK_WRONG = Colors.r("✗")
+
+
 def _format_cli(out: TeachOut) -> str:
     """
     Format TeachOut for CLI display with rich-compatible color codes.
@@ -259,111 +326,90 @@ def _format_cli(out: TeachOut) -> str:
             + (out.raw_output or out.reply or "")
         )
 
-    lines: List[str] = []
-
-    # Header colors: 94=blue, 92=green, 91=red, 93=yellow
-    lines.append(f"{Colors.b('► Corrected (natural):')} {out.corrected_natural.strip()}")
-    lines.append(f"{Colors.b('► Corrected (literal):')}  {out.corrected_literal.strip()}")
-
-    mistakes = out.mistakes or []
-    if mistakes:
-        lines.append("")
-        lines.append(Colors.r("⚠ Mistakes:"))
-        for m in mistakes:
-            frm = (m.frm or "").strip()
-            to = (m.to or "").strip()
-            why = (m.why or "").strip()
-            lines.append(f"  {Colors.r('✗')} {frm} → {Colors.g(to)}")
-            lines.append(f"     {Colors.grey(f'({why})')}")
-
-    pron = out.pronunciation or []
-    if pron:
-        lines.append("")
-        lines.append(Colors.y("🔊 Pronunciation:"))
-        for p in pron:
-            word = (p.word or "").strip()
-            ipa = (p.ipa or "").strip()
-            cue = (p.cue or "").strip()
-            ipa_part = f"/{ipa}/" if ipa else ""
-            lines.append(f"  {word} {Colors.grey(ipa_part)}")
-            lines.append(f"     → {cue}")
-
-    reply = (out.reply or "").strip()
-    if reply:
-        lines.append("")
-        lines.append(Colors.g("💬 Reply:"))
-        lines.append(f"  {reply}")
-
-    q = (out.follow_up_question or "").strip()
-    if q:
-        lines.append("")
-        lines.append(Colors.g("❓ Follow-up:"))
-        lines.append(f"  {q}")
-
-    return "\n".join(lines).strip() + Colors.RESET
+    # One block per section, separated by blank lines
+    blocks: List[str] = [
+        (
+            f"{_H_NATURAL} {out.corrected_natural}\n"
+            f"{_H_LITERAL}  {out.corrected_literal}"
+        )
+    ]
+
+    if out.mistakes:
+        blocks.append(_H_MISTAKES + "".join(
+            f"\n  {_MARK_WRONG} {m.frm} → {Colors.g(m.to)}"
+            f"\n     {Colors.grey('(' + m.why + ')')}"
+            for m in out.mistakes
+        ))
+
+    if out.pronunciation:
+        blocks.append(_H_PRONUNCIATION + "".join(
+            f"\n  {p.word} {Colors.grey('/' + p.ipa + '/' if p.ipa else '')}"
+            f"\n     → {p.cue}"
+            for p in out.pronunciation
+        ))
+
+    if out.reply:
+        blocks.append(f"{_H_REPLY}\n  {out.reply}")
+
+    if out.follow_up_question:
+        blocks.append(f"{_H_FOLLOW_UP}\n  {out.follow_up_question}")
+
+    return "\n\n".join(blocks).strip() + Colors.RESET
+
+
+_EPILOG = dedent(
+    """
+    Examples:
+      english-teacher --mode strict "i has been here since two years"
+      echo "your text" | english-teacher --mode coach
+      python -m scripts.english_teacher --mode coach "hello i am fine"
+
+    Notes:
+      - For best reliability, run as module (python -m scripts.english_teacher)
+        or use your generated wrapper.
+      - API usage: from scripts.english_teacher import teach
+    """
+).strip()
+
+_PARSER = argparse.ArgumentParser(
+    prog="english-teacher",
+    description="English conversation coach (LLM-powered)",
+    formatter_class=argparse.RawDescriptionHelpFormatter,
+    epilog=_EPILOG,
+)
+_PARSER.add_argument("--mode", default=DEFAULT_MODE, choices=sorted(_VALID_MODES), help="Teaching mode")
+_PARSER.add_argument("--json", dest="json_out", action="store_true", help="Print the answer as JSON")
+_PARSER.add_argument("text", nargs="*", help="Text to check (read from stdin when piped)")
 
 
 def _print_help() -> None:
-    print(
-        dedent(
-            """
-            english-teacher — English conversation coach (LLM-powered)
-
-            Usage:
-              english-teacher [--mode coach|strict|correct] [--json] [TEXT...]
-              echo "your text" | english-teacher --mode coach
-              python -m scripts.english_teacher --mode coach "hello i am fine"
-
-            Notes:
-              - For best reliability, run as module (python -m scripts.english_teacher)
-                or use your generated wrapper.
-              - API usage: from scripts.english_teacher import teach
-            """
-        ).strip()
-    )
+    _PARSER.print_help()
 
 
 def _parse_args(argv: List[str]) -> tuple[str, Optional[str], bool]:
-    mode = DEFAULT_MODE
-    json_out = False
-    parts: List[str] = []
-
-    i = 0
-    while i < len(argv):
-        a = argv[i]
-
-        if a in ("-h", "--help", "help"):
-            _print_help()
-            sys.exit(0)
-
-        if a == "--mode":
-            if i + 1 >= len(argv):
-                print("english-teacher: --mode requires a value", file=sys.stderr)
-                sys.exit(1)
-            mode = argv[i + 1]
-            i += 2
-            continue
-
-        if a == "--json":
-            json_out = True
-            i += 1
-            continue
-
-        if a.startswith("-"):
-            print(f"english-teacher: unknown option: {a}", file=sys.stderr)
-            _print_help()
-            sys.exit(1)
-
-        parts.append(a)
-        i += 1
+    if argv[:1] == ["help"]:
+        _print_help()
+        sys.exit(0)
+    args = _PARSER.parse_args(argv)
 
     text: Optional[str] = None
     if not sys.stdin.isatty():
         text = sys.stdin.read().strip()
-    elif parts:
-        text = " ".join(parts).strip()
+    elif args.text:
+        text = " ".join(args.text).strip()
 
-    return mode, text, json_out
+    return args.mode, text, args.json_out
+
+
+def _write_stdout(text: str) -> None:
+    """Write text to stdout as UTF-8 in one call, bypassing the text layer when possible."""
+    buf = getattr(sys.stdout, "buffer", None)
+    if buf is None:  # stdout replaced by a plain text stream
+        sys.stdout.write(text)
+        return
+    sys.stdout.flush()  # keep anything already printed in order
+    buf.write(text.encode("utf-8"))
+    buf.flush()
 
 
 def main() -> None:
@@ -374,18 +420,16 @@ def main() -> None:
         _print_help()
         sys.exit(1)
 
-    def _run() -> TeachOut:
-        return teach(text, mode=mode)
-
     if sys.stdout.isatty() and not json_out:
-        out = with_spinner("english-teacher", _run)
+        out = with_spinner("english-teacher", teach, text, mode=mode)
     else:
-        out = _run()
+        out = teach(text, mode=mode)
 
     if json_out:
-        print(json.dumps(out, ensure_ascii=False, indent=2))
+        # TeachOut is a model, not a dict: let pydantic-core serialize it
+        _write_stdout(out.model_dump_json(indent=2) + "\n")
     else:
-        print(_format_cli(out), end="")
+        _write_stdout(_format_cli(out))
 
 
 if __name__ == "__main__":
@@ -31,21 +31,25 @@ explain data/report.csv
 explain
 <paste here>
 CTRL+D
+
+# 7) Ask again instead of reusing the cached answer for identical input
+explain --no-cache some.log     # (EXPLAIN_CACHE=0 disables the cache)
 """
 
 import os
 import sys
-import subprocess
 
 from pathlib import Path
 from textwrap import dedent
 
-from .helper.llm import ollama_chat
+from .helper.llm import ollama_chat, resolve_model
+from .helper import llm_cache
 from .helper.json_utils import strip_json_fence
 from .helper.spinner import with_spinner
-from .helper.context import warn_if_approaching_context
-from .helper.env import load_repo_dotenv
+from .helper.context import warn_if_approaching_context, fit_num_ctx
+from .helper.env import load_repo_dotenv, env_bool
 from .helper.colors import Colors
+from .helper.git import read_git_diff
 load_repo_dotenv()
 
 
@@ -54,6 +58,13 @@ LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 DEFAULT_LOG_PATH = LOG_DIR / "investigate-last.log"
 
+# Files above this size are read from the end only: the prompt is capped at
+# 16k tokens and Ollama drops the oldest tokens anyway, so the head is never seen
+MAX_FILE_BYTES = 1 << 20
+
+# How long Ollama keeps the model (and its cached prompt prefix) loaded after a run
+KEEP_ALIVE = os.getenv("EXPLAIN_KEEP_ALIVE", "30m")
+
 # File-type based hints for auto mode
 CODE_EXTS = {
     ".py",
@@ -104,6 +115,14 @@ TABLE_EXTS = {
     ".tsv",
 }
 
+# One lookup instead of four set checks in kind_from_path
+_EXT_TO_KIND = {
+    **dict.fromkeys(CODE_EXTS, "code"),
+    **dict.fromkeys(CONFIG_EXTS, "config"),
+    **dict.fromkeys(DOC_EXTS, "docs"),
+    **dict.fromkeys(TABLE_EXTS, "table"),
+}
+
 
 
 # ---------------------------------------------------------------------------
@@ -111,12 +130,12 @@ TABLE_EXTS = {
 # ---------------------------------------------------------------------------
 
 
-def parse_args(argv: list[str]) -> tuple[str, bool, str | None]:
+def parse_args(argv: list[str]) -> tuple[str, bool, str | None, bool]:
     """
     Parse CLI arguments.
 
     Returns:
-        (mode, use_all, path_or_none)
+        (mode, use_all, path_or_none, use_cache)
 
     mode ∈ {"auto", "diff", "logs"}:
 
@@ -133,10 +152,12 @@ def parse_args(argv: list[str]) -> tuple[str, bool, str | None]:
       explain git          # alias for --diff
       explain log          # reuse investigate log
       explain logs
+      explain --no-cache ...   # skip the cached answer (also EXPLAIN_CACHE=0)
     """
     mode = "auto"  # auto-detect: diff vs code vs config vs docs vs table vs logs
     use_all = False
     path: str | None = None
+    use_cache = env_bool("EXPLAIN_CACHE", "1")
 
     i = 0
     while i < len(argv):
@@ -155,6 +176,11 @@ def parse_args(argv: list[str]) -> tuple[str, bool, str | None]:
             i += 1
             continue
 
+        if arg == "--no-cache":
+            use_cache = False
+            i += 1
+            continue
+
         if arg in ("log", "logs", "--log", "--logs"):
             if mode == "diff":
                 print(f"{Colors.c('explain')} {Colors.r('cannot combine logs mode with git/diff mode.')}", file=sys.stderr)
@@ -188,7 +214,7 @@ def parse_args(argv: list[str]) -> tuple[str, bool, str | None]:
         print(f"{Colors.c('explain')} {Colors.r('cannot combine a file path with git/logs mode.')}", file=sys.stderr)
         sys.exit(1)
 
-    return mode, use_all, path
+    return mode, use_all, path, use_cache
 
 
 # ---------------------------------------------------------------------------
@@ -198,24 +224,11 @@ def parse_args(argv: list[str]) -> tuple[str, bool, str | None]:
 
 def run_git_diff(use_all: bool) -> str:
     """Get diff text: staged (default) or working tree (--all)."""
-    cmd = ["git", "diff", "--cached"] if not use_all else ["git", "diff"]
-    try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        print(f"{Colors.c('[explain]')} {Colors.r('git not found on PATH.')}", file=sys.stderr)
-        sys.exit(1)
-
-    if result.returncode != 0:
-        print(f"{Colors.c('[explain]')} {Colors.r('git diff failed:')}\n{result.stderr}", file=sys.stderr)
-        sys.exit(1)
-
-    diff = result.stdout
+    # Never spawn external diff drivers or emit color codes into the prompt
+    args = ["diff", "--no-color", "--no-ext-diff"] + ([] if use_all else ["--cached"])
+    # Shared reader: one git process, streamed as bytes and decoded once; reports git errors itself.
+    # Reading stops (and git is stopped) past the same budget as files, cut at a file boundary.
+    diff = read_git_diff(args, os.getcwd(), MAX_FILE_BYTES)
     if not diff.strip():
         scope = "staged" if not use_all else "working tree"
         print(f"{Colors.c('[explain]')} {Colors.r(f'No {scope} changes to describe (empty diff).')}", file=sys.stderr)
@@ -224,6 +237,29 @@ def run_git_diff(use_all: bool) -> str:
     return diff
 
 
+def read_text_tail(path: Path, max_bytes: int = MAX_FILE_BYTES) -> str:
+    """
+    Read a text file, keeping only its last max_bytes (cut at a line start).
+    Small files are read whole; large ones are not loaded into memory at all.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= max_bytes:
+            return f.read().decode("utf-8", errors="ignore")
+        f.seek(size - max_bytes)
+        data = f.read(max_bytes)
+
+    # Drop the partial first line left by the seek
+    nl = data.find(b"\n")
+    if nl != -1:
+        data = data[nl + 1:]
+    print(
+        f"{Colors.c('[explain]')} {Colors.y(f'{path} is {size >> 10} KiB; using its last {len(data) >> 10} KiB.')}",
+        file=sys.stderr,
+    )
+    return data.decode("utf-8", errors="ignore")
+
+
 def read_investigate_log() -> str:
     """Read the last investigate log explicitly."""
     log_path_str = os.getenv("INVESTIGATE_LOG", str(DEFAULT_LOG_PATH))
@@ -238,7 +274,7 @@ def read_investigate_log() -> str:
         )
         sys.exit(1)
 
-    return log_path.read_text(encoding="utf-8", errors="ignore")
+    return read_text_tail(log_path)
 
 
 def read_auto_input(path: str | None) -> str:
@@ -259,7 +295,7 @@ def read_auto_input(path: str | None) -> str:
         if not p.exists():
             print(f"{Colors.c('[explain]')} {Colors.r(f'File not found: {p}')}", file=sys.stderr)
             sys.exit(1)
-        return p.read_text(encoding="utf-8", errors="ignore")
+        return read_text_tail(p)
 
     # 3) interactive paste
     print(f"{Colors.c('[explain]')} {Colors.m('Paste text (logs, diff, code, config, docs, or data), then press Ctrl+D.')}", file=sys.stderr)
@@ -276,18 +312,12 @@ def read_auto_input(path: str | None) -> str:
 
 
 def looks_like_git_diff(text: str) -> bool:
-    """Cheap heuristic to recognize a git diff."""
-    if "diff --git " in text:
-        return True
-    lines = text.splitlines()
-    for ln in lines[:50]:
-        if ln.startswith("diff --git "):
-            return True
-        if ln.startswith(("+++", "---")) and any(
-            line.startswith("diff --git ") for line in lines[:10]
-        ):
-            return True
-    return False
+    """
+    Cheap heuristic to recognize a git diff: a single substring search.
+    (Any line starting with "diff --git " is found by it, so the text is
+    never split into lines.)
+    """
+    return "diff --git " in text
 
 
 def kind_from_path(path: str | None) -> str | None:
@@ -298,35 +328,33 @@ def kind_from_path(path: str | None) -> str | None:
     """
     if not path:
         return None
-    suffix = Path(path).suffix.lower()
-    if suffix in CODE_EXTS:
-        return "code"
-    if suffix in CONFIG_EXTS:
-        return "config"
-    if suffix in DOC_EXTS:
-        return "docs"
-    if suffix in TABLE_EXTS:
-        return "table"
-    return None
+    # splitext matches Path.suffix (".env" has none) without building a Path
+    return _EXT_TO_KIND.get(os.path.splitext(path)[1].lower())
+
+
+_HEAD_CHARS = 16384
+
+
+def _head_lines(text: str, n: int) -> list[str]:
+    """First n non-blank lines, looking only at the start of the text (bounded work for huge inputs)."""
+    return [ln for ln in text[:_HEAD_CHARS].splitlines() if ln.strip()][:n]
 
 
 def looks_like_json_or_yaml(text: str) -> bool:
-    stripped = text.lstrip()
-    if stripped.startswith("{") or stripped.startswith("["):
+    head = text[:_HEAD_CHARS].lstrip()
+    if head.startswith("{") or head.startswith("["):
         # very rough JSON-ish
         return True
     # simple YAML-ish: key: value lines
-    lines = [ln for ln in text.splitlines() if ln.strip()]
-    sample = lines[:20]
     kv_lines = 0
-    for ln in sample:
+    for ln in _head_lines(head, 20):
         if ":" in ln and not ln.strip().startswith("#"):
             kv_lines += 1
     return kv_lines >= 3
 
 
 def looks_like_table(text: str) -> bool:
-    lines = [ln for ln in text.splitlines() if ln.strip()]
+    lines = _head_lines(text, 2)
     if len(lines) < 2:
         return False
     first = lines[0]
@@ -359,274 +387,278 @@ def guess_kind_from_content(text: str) -> str:
 # Prompt building
 # ---------------------------------------------------------------------------
 
-
-def build_prompts(content: str, kind: str) -> tuple[str, str]:
+# System prompts are dedented once at import, not on every call
+_DIFF_SYSTEM_PROMPT = dedent(
     """
-    kind ∈ {"diff", "logs", "code", "config", "docs", "table"}
+    You are an assistant that explains git diffs for developers.
+
+    Input:
+      - A git diff (possibly multiple files, additions/removals/renames).
+      - Sometimes diff-like content mixed with a few log lines.
+
+    Your tasks:
+
+      1) Explain what this diff does
+         - Group your explanation by file when helpful.
+         - Describe behavior changes in plain language.
+         - Point out important refactors, new features, or deletions.
+
+      2) Highlight potential problems
+         - Possible bugs or regressions.
+         - Suspicious patterns (e.g., missing error handling, unsafe defaults,
+           magic numbers, race conditions, brittle tests).
+         - Interface or API changes that might break callers.
+
+      3) Suggest improvements
+         - Better structure, naming, or separation of concerns.
+         - Additional tests or checks worth adding.
+         - Any obvious performance or reliability improvements.
+
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - You MAY include small diff snippets when necessary,
+        but do NOT respond with only a code block.
+      - Do NOT re-print the entire diff.
+      - If the diff seems trivial or mostly mechanical, say that briefly.
     """
-    if kind == "diff":
-        system_prompt = dedent(
-            """
-            You are an assistant that explains git diffs for developers.
-
-            Input:
-              - A git diff (possibly multiple files, additions/removals/renames).
-              - Sometimes diff-like content mixed with a few log lines.
-
-            Your tasks:
-
-              1) Explain what this diff does
-                 - Group your explanation by file when helpful.
-                 - Describe behavior changes in plain language.
-                 - Point out important refactors, new features, or deletions.
-
-              2) Highlight potential problems
-                 - Possible bugs or regressions.
-                 - Suspicious patterns (e.g., missing error handling, unsafe defaults,
-                   magic numbers, race conditions, brittle tests).
-                 - Interface or API changes that might break callers.
-
-              3) Suggest improvements
-                 - Better structure, naming, or separation of concerns.
-                 - Additional tests or checks worth adding.
-                 - Any obvious performance or reliability improvements.
-
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - You MAY include small diff snippets when necessary,
-                but do NOT respond with only a code block.
-              - Do NOT re-print the entire diff.
-              - If the diff seems trivial or mostly mechanical, say that briefly.
-            """
-        ).strip()
-
-        user_prompt = (
-            "Explain the following git diff, following the tasks above.\n\n"
-            "Here is the diff:\n\n"
-            "```diff\n"
-            f"{content}\n"
-            "```"
-        )
+).strip()
 
-    elif kind == "code":
-        system_prompt = dedent(
-            """
-            You are an assistant that explains source code for developers.
-
-            Input:
-              - A single file of source code (Python, TypeScript, JavaScript, Go,
-                Rust, C/C++, C#, PHP, Ruby, Swift, shell, or similar).
-              - It may be a script, a module, or an entrypoint.
-
-            Your tasks:
-
-              1) High-level summary
-                 - Explain what this code does overall.
-                 - Describe the main responsibilities of the script/module.
-
-              2) Walk-through of important pieces
-                 - Explain key functions, classes, and control flow.
-                 - Call out how inputs are received and how outputs/results are produced.
-
-              3) Potential issues and edge cases
-                 - Identify obvious bugs, race conditions, or error-handling gaps.
-                 - Mention places where robustness or clarity could be improved.
-
-              4) Suggestions for improvement
-                 - Refactoring ideas (extraction, naming, structure).
-                 - Testing ideas (what should be unit/integration tested).
-                 - Any performance or maintainability concerns.
-
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - You MAY include short code snippets to illustrate points,
-                but do NOT respond with only a code block.
-              - Do NOT just reprint the file.
-              - Focus on explanation and reasoning, not reformatting.
-            """
-        ).strip()
-
-        user_prompt = (
-            "Explain the following source code according to the tasks above.\n\n"
-            "Here is the code:\n\n"
-            "```code\n"
-            f"{content}\n"
-            "```"
-        )
-
-    elif kind == "config":
-        system_prompt = dedent(
-            """
-            You are an assistant that explains configuration / structured data files.
+_CODE_SYSTEM_PROMPT = dedent(
+    """
+    You are an assistant that explains source code for developers.
+
+    Input:
+      - A single file of source code (Python, TypeScript, JavaScript, Go,
+        Rust, C/C++, C#, PHP, Ruby, Swift, shell, or similar).
+      - It may be a script, a module, or an entrypoint.
+
+    Your tasks:
+
+      1) High-level summary
+         - Explain what this code does overall.
+         - Describe the main responsibilities of the script/module.
+
+      2) Walk-through of important pieces
+         - Explain key functions, classes, and control flow.
+         - Call out how inputs are received and how outputs/results are produced.
+
+      3) Potential issues and edge cases
+         - Identify obvious bugs, race conditions, or error-handling gaps.
+         - Mention places where robustness or clarity could be improved.
+
+      4) Suggestions for improvement
+         - Refactoring ideas (extraction, naming, structure).
+         - Testing ideas (what should be unit/integration tested).
+         - Any performance or maintainability concerns.
+
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - You MAY include short code snippets to illustrate points,
+        but do NOT respond with only a code block.
+      - Do NOT just reprint the file.
+      - Focus on explanation and reasoning, not reformatting.
+    """
+).strip()
 
-            Input:
-              - JSON, YAML, TOML, INI, .env, or similar configuration/data.
-              - It may be an application config, service settings, or structured payload.
+_CONFIG_SYSTEM_PROMPT = dedent(
+    """
+    You are an assistant that explains configuration / structured data files.
 
-            Your tasks:
+    Input:
+      - JSON, YAML, TOML, INI, .env, or similar configuration/data.
+      - It may be an application config, service settings, or structured payload.
 
-              1) Structural overview
-                 - Describe the overall structure: top-level sections/objects and how they relate.
-                 - Group related keys/fields into logical clusters (e.g. database, auth, logging).
+    Your tasks:
 
-              2) Key fields and their meaning
-                 - Explain important keys and their likely role (endpoints, credentials, timeouts,
-                   feature flags, environment settings, etc.).
-                 - Highlight defaults and where overrides might matter.
+      1) Structural overview
+         - Describe the overall structure: top-level sections/objects and how they relate.
+         - Group related keys/fields into logical clusters (e.g. database, auth, logging).
 
-              3) Potential issues
-                 - Point out obviously dangerous or surprising values (e.g. debug=true in prod,
-                   0.0.0.0 binds, weak timeouts, missing auth).
-                 - Identify inconsistent or duplicate settings.
+      2) Key fields and their meaning
+         - Explain important keys and their likely role (endpoints, credentials, timeouts,
+           feature flags, environment settings, etc.).
+         - Highlight defaults and where overrides might matter.
 
-              4) Suggestions
-                 - Suggest clearer structure or naming if the config is messy.
-                 - Suggest safer defaults or sensible ranges where appropriate.
+      3) Potential issues
+         - Point out obviously dangerous or surprising values (e.g. debug=true in prod,
+           0.0.0.0 binds, weak timeouts, missing auth).
+         - Identify inconsistent or duplicate settings.
 
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - You MAY include short key examples, but do NOT dump the entire file back.
-              - Do NOT invent keys that are not present.
-            """
-        ).strip()
+      4) Suggestions
+         - Suggest clearer structure or naming if the config is messy.
+         - Suggest safer defaults or sensible ranges where appropriate.
 
-        user_prompt = (
-            "Explain the following configuration / structured data according to the tasks above.\n\n"
-            "Here is the content:\n\n"
-            "```config\n"
-            f"{content}\n"
-            "```"
-        )
-
-    elif kind == "docs":
-        system_prompt = dedent(
-            """
-            You are an assistant that explains Markdown / documentation files.
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - You MAY include short key examples, but do NOT dump the entire file back.
+      - Do NOT invent keys that are not present.
+    """
+).strip()
 
-            Input:
-              - A Markdown or similar documentation file (README, spec, notes, etc.).
+_DOCS_SYSTEM_PROMPT = dedent(
+    """
+    You are an assistant that explains Markdown / documentation files.
 
-            Your tasks:
+    Input:
+      - A Markdown or similar documentation file (README, spec, notes, etc.).
 
-              1) Outline
-                 - Summarize the main sections and their purpose.
-                 - Provide a short high-level overview of what this document is about.
+    Your tasks:
 
-              2) Key points
-                 - Highlight the most important ideas, instructions, or decisions.
-                 - Group related topics (setup, usage, API, architecture, constraints).
+      1) Outline
+         - Summarize the main sections and their purpose.
+         - Provide a short high-level overview of what this document is about.
 
-              3) Gaps or unclear areas
-                 - Point out sections that might be confusing or underspecified.
-                 - Suggest where examples, diagrams, or more detail would help.
+      2) Key points
+         - Highlight the most important ideas, instructions, or decisions.
+         - Group related topics (setup, usage, API, architecture, constraints).
 
-              4) Suggestions for improvement
-                 - Propose improvements to structure, ordering, and clarity.
-                 - Call out outdated-looking sections if any.
+      3) Gaps or unclear areas
+         - Point out sections that might be confusing or underspecified.
+         - Suggest where examples, diagrams, or more detail would help.
 
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - Do NOT just restate every bullet line-by-line.
-              - Focus on the big picture and practical takeaways.
-            """
-        ).strip()
+      4) Suggestions for improvement
+         - Propose improvements to structure, ordering, and clarity.
+         - Call out outdated-looking sections if any.
 
-        user_prompt = (
-            "Explain the following documentation / Markdown file according to the tasks above.\n\n"
-            "Here is the content:\n\n"
-            "```markdown\n"
-            f"{content}\n"
-            "```"
-        )
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - Do NOT just restate every bullet line-by-line.
+      - Focus on the big picture and practical takeaways.
+    """
+).strip()
 
-    elif kind == "table":
-        system_prompt = dedent(
-            """
-            You are an assistant that explains tabular data (CSV/TSV).
+_TABLE_SYSTEM_PROMPT = dedent(
+    """
+    You are an assistant that explains tabular data (CSV/TSV).
 
-            Input:
-              - A CSV/TSV-like text with a header row and data rows.
+    Input:
+      - A CSV/TSV-like text with a header row and data rows.
 
-            Your tasks:
+    Your tasks:
 
-              1) Column overview
-                 - Describe what each column appears to represent.
-                 - Group related columns (identifiers, metrics, timestamps, flags).
+      1) Column overview
+         - Describe what each column appears to represent.
+         - Group related columns (identifiers, metrics, timestamps, flags).
 
-              2) Data characteristics
-                 - Comment on obvious patterns (e.g. ranges, monotonic fields, boolean flags).
-                 - Mention any apparent groupings or categories.
+      2) Data characteristics
+         - Comment on obvious patterns (e.g. ranges, monotonic fields, boolean flags).
+         - Mention any apparent groupings or categories.
 
-              3) Potential issues
-                 - Point out missing/empty values, obvious inconsistencies, or weird outliers
-                   if they are visible in the sample.
-                 - Call out columns that may be redundant or ambiguous.
+      3) Potential issues
+         - Point out missing/empty values, obvious inconsistencies, or weird outliers
+           if they are visible in the sample.
+         - Call out columns that may be redundant or ambiguous.
 
-              4) Suggestions
-                 - Suggest better naming where columns are unclear.
-                 - Suggest additional derived fields or aggregations that might be useful.
+      4) Suggestions
+         - Suggest better naming where columns are unclear.
+         - Suggest additional derived fields or aggregations that might be useful.
 
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - You MAY refer to individual rows as examples, but do NOT dump the whole table back.
-              - If the file is very large, treat the visible content as a sample.
-            """
-        ).strip()
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - You MAY refer to individual rows as examples, but do NOT dump the whole table back.
+      - If the file is very large, treat the visible content as a sample.
+    """
+).strip()
 
-        user_prompt = (
-            "Explain the following tabular data (CSV/TSV) according to the tasks above.\n\n"
-            "Here is the content:\n\n"
-            "```table\n"
-            f"{content}\n"
-            "```"
-        )
+_LOGS_SYSTEM_PROMPT = dedent(
+    """
+    You are a precise assistant that explains logs and text traces.
 
-    else:  # "logs"
-        system_prompt = dedent(
-            """
-            You are a precise assistant that explains logs and text traces.
+    Input:
+      - Application or server logs, stack traces, or textual diagnostics.
+      - Possibly mixed with configuration snippets or code fragments.
 
-            Input:
-              - Application or server logs, stack traces, or textual diagnostics.
-              - Possibly mixed with configuration snippets or code fragments.
+    Your tasks:
 
-            Your tasks:
+      1) Summary
+         - Provide a concise summary of what is happening.
+         - Mention the main operations, requests, or phases.
 
-              1) Summary
-                 - Provide a concise summary of what is happening.
-                 - Mention the main operations, requests, or phases.
+      2) Errors & warnings
+         - Identify the most important errors or warning patterns.
+         - Quote only a few key lines (no giant dumps).
+         - Explain what they mean and why they matter.
 
-              2) Errors & warnings
-                 - Identify the most important errors or warning patterns.
-                 - Quote only a few key lines (no giant dumps).
-                 - Explain what they mean and why they matter.
+      3) Root cause & reasoning
+         - Suggest the most likely root cause(s) based on the evidence.
+         - Call out uncertainties explicitly instead of guessing.
 
-              3) Root cause & reasoning
-                 - Suggest the most likely root cause(s) based on the evidence.
-                 - Call out uncertainties explicitly instead of guessing.
+      4) Next steps / improvements
+         - Suggest concrete next steps: commands to run, files to inspect,
+           configuration to double-check, or logs to enable.
+         - Mention any obvious robustness or observability improvements.
 
-              4) Next steps / improvements
-                 - Suggest concrete next steps: commands to run, files to inspect,
-                   configuration to double-check, or logs to enable.
-                 - Mention any obvious robustness or observability improvements.
+    Constraints:
+      - Your answer MUST be primarily natural-language prose.
+      - You MAY include short quoted lines, but do NOT respond with only a code block.
+      - Do NOT invent logs or stack traces that do not exist.
+      - Do NOT give generic advice that ignores the actual content.
+    """
+).strip()
 
-            Constraints:
-              - Your answer MUST be primarily natural-language prose.
-              - You MAY include short quoted lines, but do NOT respond with only a code block.
-              - Do NOT invent logs or stack traces that do not exist.
-              - Do NOT give generic advice that ignores the actual content.
-            """
-        ).strip()
 
-        user_prompt = (
+# (system prompt, user-prompt prefix) per kind; the content and closing fence follow the prefix.
+# Everything before the content is constant per kind (no paths, times or sizes), so a
+# still-loaded model can reuse its cached prefix (see EXPLAIN_KEEP_ALIVE) across runs.
+_PROMPTS: dict[str, tuple[str, str]] = {
+    "diff": (
+        _DIFF_SYSTEM_PROMPT,
+        (
+            "Explain the following git diff, following the tasks above.\n\n"
+            "Here is the diff:\n\n"
+            "```diff\n"
+        ),
+    ),
+    "code": (
+        _CODE_SYSTEM_PROMPT,
+        (
+            "Explain the following source code according to the tasks above.\n\n"
+            "Here is the code:\n\n"
+            "```code\n"
+        ),
+    ),
+    "config": (
+        _CONFIG_SYSTEM_PROMPT,
+        (
+            "Explain the following configuration / structured data according to the tasks above.\n\n"
+            "Here is the content:\n\n"
+            "```config\n"
+        ),
+    ),
+    "docs": (
+        _DOCS_SYSTEM_PROMPT,
+        (
+            "Explain the following documentation / Markdown file according to the tasks above.\n\n"
+            "Here is the content:\n\n"
+            "```markdown\n"
+        ),
+    ),
+    "table": (
+        _TABLE_SYSTEM_PROMPT,
+        (
+            "Explain the following tabular data (CSV/TSV) according to the tasks above.\n\n"
+            "Here is the content:\n\n"
+            "```table\n"
+        ),
+    ),
+    "logs": (
+        _LOGS_SYSTEM_PROMPT,
+        (
             "Explain the following logs / text according to the tasks above.\n\n"
             "Here is the content (newest lines are usually last):\n\n"
             "```text\n"
-            f"{content}\n"
-            "```"
-        )
+        ),
+    ),
+}
 
-    return system_prompt, user_prompt
+
+def build_prompts(content: str, kind: str) -> tuple[str, str]:
+    """
+    kind ∈ {"diff", "logs", "code", "config", "docs", "table"}
+    (anything else is treated as "logs")
+    """
+    system_prompt, prefix = _PROMPTS.get(kind, _PROMPTS["logs"])
+    return system_prompt, f"{prefix}{content}\n```"
 
 
 # ---------------------------------------------------------------------------
@@ -634,24 +666,43 @@ def build_prompts(content: str, kind: str) -> tuple[str, str]:
 # ---------------------------------------------------------------------------
 
 
-def call_model(system_prompt: str, user_prompt: str, label: str) -> str:
-    def _call() -> str:
-        raw = ollama_chat(
+def call_model(system_prompt: str, user_prompt: str, label: str, use_cache: bool = True) -> str:
+    """
+    Ask the model, or return the cached answer for identical input
+    (same prompts, model and context size) from an earlier run.
+    """
+    model = os.getenv("EXPLAIN_MODEL")
+    # Prose answers run long: reserve room for them, keep 16k as the ceiling
+    num_ctx = fit_num_ctx(system_prompt, user_prompt, response_tokens=2048, max_ctx=16000)
+
+    resolved = resolve_model(model)
+    key = llm_cache.cache_key("explain", system_prompt, user_prompt, resolved, str(num_ctx))
+    if use_cache:
+        cached = llm_cache.lookup(key)
+        if cached is not None:
+            return cached
+
+    try:
+        raw = with_spinner(
+            Colors.c(label),
+            ollama_chat,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            model=os.getenv("EXPLAIN_MODEL"),
-            num_ctx=16000,
+            model=model,
+            num_ctx=num_ctx,
             timeout=180,
+            keep_alive=KEEP_ALIVE,
         )
-        # For explain: we want plain text; fences/outer quotes are noise.
-        return strip_json_fence(raw)
-
-    try:
-        return with_spinner(Colors.c(label), _call)
     except Exception as e:
         print(f"{Colors.c('[explain]')} {Colors.r(f'Error calling Ollama: {e}')}", file=sys.stderr)
         sys.exit(1)
 
+    # For explain: we want plain text; fences/outer quotes are noise.
+    answer = strip_json_fence(raw)
+    if answer:
+        llm_cache.store(key, answer, resolved)
+    return answer
+
 
 # ---------------------------------------------------------------------------
 # Main
@@ -659,7 +710,7 @@ def call_model(system_prompt: str, user_prompt: str, label: str) -> str:
 
 
 def main() -> None:
-    mode, use_all, path = parse_args(sys.argv[1:])
+    mode, use_all, path, use_cache = parse_args(sys.argv[1:])
 
     if mode == "diff":
         content = run_git_diff(use_all)
@@ -683,7 +734,7 @@ def main() -> None:
     warn_if_approaching_context("explain", content)
 
     system_prompt, user_prompt = build_prompts(content, kind)
-    answer = call_model(system_prompt, user_prompt, "explain")
+    answer = call_model(system_prompt, user_prompt, "explain", use_cache)
     print(answer)
 
 
@@ -1,7 +1,33 @@
 # helper/clipboard.py
+import functools
+import os
+import shutil
 import subprocess
 import sys
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+# (command, label, display env var the backend needs or None) in order of preference
+_CANDIDATES: List[Tuple[List[str], str, Optional[str]]] = [
+    (["wl-copy"], "wl-copy", "WAYLAND_DISPLAY"),
+    (["xclip", "-selection", "clipboard"], "xclip", "DISPLAY"),
+    (["xsel", "--clipboard", "--input"], "xsel", "DISPLAY"),
+    (["pbcopy"], "pbcopy", None),
+    (["clip.exe"], "clip.exe", None),
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_backends() -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+    """
+    Candidates whose binary is on PATH (probed once, without spawning anything).
+    Wayland/X11 tools are skipped when their display server is not set,
+    so a headless box does not spawn copies that can only fail.
+    """
+    return tuple(
+        (tuple(cmd), label)
+        for cmd, label, display in _CANDIDATES
+        if (display is None or os.environ.get(display)) and shutil.which(cmd[0])
+    )
 
 
 def copy_to_clipboard(text: str) -> Tuple[bool, Optional[str]]:
@@ -15,21 +41,16 @@ def copy_to_clipboard(text: str) -> Tuple[bool, Optional[str]]:
       - pbcopy (macOS)
       - clip.exe (WSL / Windows)
 
+    Only binaries found on PATH (and, for wl-copy/xclip/xsel, with
+    WAYLAND_DISPLAY/DISPLAY set) are tried.
+
     Returns:
       (success, backend_name_or_None)
     """
-    candidates = [
-        (["wl-copy"], "wl-copy"),
-        (["xclip", "-selection", "clipboard"], "xclip"),
-        (["xsel", "--clipboard", "--input"], "xsel"),
-        (["pbcopy"], "pbcopy"),
-        (["clip.exe"], "clip.exe"),
-    ]
-
-    for cmd, label in candidates:
+    for cmd, label in _installed_backends():
         try:
             proc = subprocess.run(
-                cmd,
+                list(cmd),
                 input=text,
                 text=True,
                 stdout=subprocess.DEVNULL,
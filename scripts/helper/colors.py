@@ -36,9 +36,18 @@ class Colors:
     REVERSE = "\033[7m"
     HIDDEN = "\033[8m"
 
+    # Decided once (see refresh()), not with an isatty() call per colored token
+    enabled = False
+
+    @classmethod
+    def refresh(cls) -> bool:
+        """Re-check whether stdout gets colors (a TTY, or FORCE_COLOR=1)."""
+        cls.enabled = sys.stdout.isatty() or os.getenv("FORCE_COLOR") == "1"
+        return cls.enabled
+
     @staticmethod
     def _wrap(text: str, color_code: str) -> str:
-        if not sys.stdout.isatty() and os.getenv("FORCE_COLOR") != "1":
+        if not Colors.enabled:
             return text
         return f"{color_code}{text}{Colors.RESET}"
 
@@ -65,3 +74,6 @@ class Colors:
     def bold(text: str) -> str: return Colors._wrap(text, Colors.BOLD)
     @staticmethod
     def dim(text: str) -> str: return Colors._wrap(text, Colors.DIM)
+
+
+Colors.refresh()
@@ -23,3 +23,24 @@ def warn_if_approaching_context(label: str, text: str) -> None:
             f"(soft limit ~{_SOFT_CONTEXT_LIMIT}); model context may be tight.",
             file=sys.stderr,
         )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for sizing requests (~3 characters per token for code/diffs)."""
+    return len(text) // 3
+
+
+def fit_num_ctx(
+    *texts: str,
+    response_tokens: int = 512,
+    min_ctx: int = 2048,
+    max_ctx: int = 16384,
+) -> int:
+    """
+    Smallest power-of-two context window that fits the prompt plus the response,
+    clamped to [min_ctx, max_ctx]. Ollama sizes the KV cache by num_ctx, so a
+    small prompt should not pay for a huge window.
+    Pass the prompt parts separately; they are sized without being joined.
+    """
+    needed = sum(estimate_tokens(t) for t in texts) + response_tokens
+    return min(max_ctx, max(min_ctx, 1 << (needed - 1).bit_length()))
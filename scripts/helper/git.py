@@ -1,7 +1,16 @@
+import os
 import subprocess
 import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
 from .colors import Colors
 
+# Read-only git calls must not take the index lock (or refresh the index) while
+# an editor or another git process works in the same repo
+_GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
 def run_git_cmd(args: list[str], cwd: str) -> subprocess.CompletedProcess[str]:
     """Executes a git command and returns the completed process object."""
     try:
@@ -9,7 +18,11 @@ def run_git_cmd(args: list[str], cwd: str) -> subprocess.CompletedProcess[str]:
             ["git", "-C", cwd] + args,
             capture_output=True,
             text=True,
-            check=False 
+            check=False,
+            # git never reads stdin here, and there are no fds worth closing
+            stdin=subprocess.DEVNULL,
+            close_fds=False,
+            env=_GIT_ENV,
         )
     except FileNotFoundError:
         # Fallback if git is not installed or weird system
@@ -25,43 +38,248 @@ def git_stdout(args: list[str], cwd: str) -> str:
          return ""
     return (res.stdout or "").strip()
 
-def current_branch(cwd: str) -> str:
-    name = git_stdout(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
-    if not name or name == "HEAD":
+@dataclass(slots=True)
+class GitStatus:
+    branch: Optional[str] = None  # None on a detached HEAD
+    upstream: Optional[str] = None
+    staged: list[str] = field(default_factory=list)
+    unstaged: list[str] = field(default_factory=list)
+
+
+# Space-separated fields per porcelain v2 record type (ordinary, rename/copy, unmerged)
+_STATUS_FIELDS = {"1": 9, "2": 10, "u": 11}
+
+
+def git_status(cwd: str) -> GitStatus:
+    """
+    Branch, upstream and changed paths from a single
+    `git status --porcelain=v2 --branch -z` call, instead of one git process
+    per question. Untracked and ignored files are not reported.
+    """
+    status = GitStatus()
+    res = run_git_cmd(["status", "--porcelain=v2", "--branch", "-z", "--untracked-files=no"], cwd)
+    if res.returncode != 0:
+        return status
+
+    records = iter(res.stdout.split("\0"))
+    for rec in records:
+        if rec.startswith("# branch.head "):
+            head = rec[len("# branch.head "):]
+            status.branch = None if head == "(detached)" else head
+        elif rec.startswith("# branch.upstream "):
+            status.upstream = rec[len("# branch.upstream "):]
+        elif rec[:2] in ("1 ", "2 ", "u "):
+            # "<type> <XY> ... <path>": the path is the last field (it may contain spaces)
+            fields = _STATUS_FIELDS[rec[0]]
+            xy, path = rec[2:4], rec.split(" ", fields - 1)[-1]
+            if rec[0] == "2":
+                next(records, None)  # renames/copies carry the original path as the next record
+            if xy[0] != ".":
+                status.staged.append(path)
+            if xy[1] != ".":
+                status.unstaged.append(path)
+    return status
+
+
+def current_branch(cwd: str, status: Optional[GitStatus] = None) -> str:
+    name = (status or git_status(cwd)).branch
+    if not name:
         raise RuntimeError("Not on a branch (detached HEAD). Cannot set upstream.")
     return name
 
-def has_upstream(cwd: str) -> bool:
-    # exits non-zero if no upstream is configured
-    res = run_git_cmd(["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"], cwd)
-    return res.returncode == 0
+def has_upstream(cwd: str, status: Optional[GitStatus] = None) -> bool:
+    return (status or git_status(cwd)).upstream is not None
 
 def push_with_upstream_if_needed(cwd: str) -> None:
     """
     Pushes to origin. If the current branch has no upstream, sets it to origin/<branch>.
     """
-    if has_upstream(cwd):
+    status = git_status(cwd)
+    if has_upstream(cwd, status):
         subprocess.run(["git", "-C", cwd, "push"], check=True)
         return
 
-    branch = current_branch(cwd)
+    branch = current_branch(cwd, status)
     subprocess.run(
         ["git", "-C", cwd, "push", "--set-upstream", "origin", branch],
         check=True,
     )
 
-def get_git_diff(use_all: bool, cwd: str) -> str:
-    """Retrieves diff text, falling back from staged to unstaged if needed."""
+# git output is read in blocks of this size instead of line by line
+_READ_SIZE = 64 * 1024
+
+
+def read_git_diff(args: list[str], cwd: str, max_chars: Optional[int] = None) -> str:
+    """
+    Stream `git <args>` output and stop reading once max_chars is reached.
+    The cut is made at the last `diff --git` boundary that fits, so hunks stay
+    intact; only a single oversized first file is cut mid-way.
+
+    Output is read as bytes (the budget is counted in bytes) and decoded once
+    as UTF-8, independent of the locale; the discarded tail is never decoded.
+    Exits with git's error message if git fails (e.g. not a repository).
+    stderr goes to a temporary file rather than a pipe, so git cannot block
+    on unread warnings while we are still waiting for stdout.
+    """
+    err_file = tempfile.TemporaryFile()
+    try:
+        proc = subprocess.Popen(
+            ["git", "-C", cwd] + args,
+            stdout=subprocess.PIPE,
+            stderr=err_file,
+            stdin=subprocess.DEVNULL,
+            close_fds=False,
+            env=_GIT_ENV,
+        )
+    except FileNotFoundError:
+        err_file.close()
+        print(f"{Colors.r('Error: git not found in PATH')}", file=sys.stderr)
+        sys.exit(1)
+
+    buf = bytearray()
+    truncated = False
+    err = b""
+    assert proc.stdout is not None
+    try:
+        while True:
+            block = proc.stdout.read(_READ_SIZE)
+            if not block:
+                break
+            buf += block
+            if max_chars is not None and len(buf) > max_chars:
+                truncated = True
+                break
+    finally:
+        if truncated:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+        if not truncated and proc.returncode != 0:
+            err_file.seek(0)
+            err = err_file.read()
+        err_file.close()
+
+    if not truncated and proc.returncode != 0:
+        # First line only: outside a repo git appends its whole usage text
+        message = err.decode("utf-8", errors="replace").strip().partition("\n")[0]
+        print(f"{Colors.r('Error: git ' + args[0] + ' failed:')} {message}", file=sys.stderr)
+        sys.exit(1)
+
+    if truncated:
+        # Keep whole files; a single oversized first file is cut at a line end
+        cut = buf.rfind(b"\ndiff --git ", 0, max_chars + 1) + 1
+        if cut <= 0:
+            cut = buf.rfind(b"\n", 0, max_chars) + 1
+        del buf[cut:]
+        buf += b"\n... (diff truncated)\n"
+    return buf.decode("utf-8", errors="replace")
+
+
+def get_git_diff(
+    use_all: bool,
+    cwd: str,
+    max_chars: Optional[int] = None,
+    exclude: Sequence[str] = (),
+) -> str:
+    """
+    Retrieves the staged diff, or the unstaged one if nothing is staged.
+    With max_chars, only that much of the diff is read (see read_git_diff).
+    Paths matching `exclude` (git pathspec patterns) are filtered by git itself,
+    unless they are the only changes.
+    """
+    pathspec = ["--", "."] + [f":(exclude){p}" for p in exclude] if exclude else []
+
+    def _read(args: list[str]) -> str:
+        args = ["diff", "--no-color", "-M"] + args
+        diff = read_git_diff(args + pathspec, cwd, max_chars)
+        if pathspec and not diff.strip():
+            # Only excluded files changed: describe them rather than nothing
+            diff = read_git_diff(args, cwd, max_chars)
+        return diff
+
     if use_all:
-        res = run_git_cmd(["diff", "HEAD"], cwd)
+        diff = _read(["HEAD"])
     else:
-        res = run_git_cmd(["diff", "--cached"], cwd)
-        if not res.stdout.strip():
-            # If nothing staged, try unstaged
-            res = run_git_cmd(["diff"], cwd)
+        # Staged changes win; only without them is the working tree diffed.
+        # One status call decides, so only one diff has to run.
+        status = git_status(cwd)
+        diff = _read(["--cached"] if status.staged or not status.unstaged else [])
 
-    if not res.stdout.strip():
+    if not diff.strip():
         # Clean exit if absolutely no changes
         print(f"\n{Colors.r('✗ No changes detected in:')} {cwd}")
         sys.exit(0)
-    return res.stdout
+    return diff
+
+# -----------------------------------------------------------------------------
+# Diff helpers
+# -----------------------------------------------------------------------------
+
+def compact_diff(diff: str, per_file_lines: int = 200) -> str:
+    """
+    Cap every file section of a unified diff at per_file_lines lines.
+    Oversized sections first lose their unchanged context lines (headers,
+    hunk headers and +/- lines are kept); whatever is still over the cap is
+    replaced by a single "... (N lines elided)" marker. Smaller sections are
+    kept untouched.
+    """
+    if per_file_lines <= 0 or diff.count("\n") <= per_file_lines:
+        return diff
+
+    parts: list[str] = []
+    start = 0
+    while start < len(diff):
+        nxt = diff.find("\ndiff --git ", start)
+        end = nxt + 1 if nxt != -1 else len(diff)
+        section = diff[start:end]
+        if section.count("\n") > per_file_lines:
+            all_lines = section.splitlines(keepends=True)
+            lines = [ln for ln in all_lines if not ln.startswith(" ")]
+            parts.extend(lines[:per_file_lines])
+            elided = len(all_lines) - min(len(lines), per_file_lines)
+            parts.append(f"... ({elided} lines elided)\n")
+        else:
+            parts.append(section)
+        start = end
+    return "".join(parts)
+
+
+@dataclass(slots=True)
+class DiffStats:
+    file_count: int = 0
+    added: int = 0
+    removed: int = 0
+    files: list[str] = field(default_factory=list)
+    new_files: list[str] = field(default_factory=list)
+
+
+def analyze_diff(diff: str) -> DiffStats:
+    """
+    Collect file/line statistics from a unified git diff without splitting it
+    into lines: +/- lines are counted with str.count and only the
+    `diff --git` headers are located and parsed.
+    File paths are taken from the "b/" side of each header.
+    """
+    text = "\n" + diff
+    stats = DiffStats(
+        added=text.count("\n+") - text.count("\n+++ "),
+        removed=text.count("\n-") - text.count("\n--- "),
+    )
+    pos = text.find("\ndiff --git ")
+    while pos != -1:
+        eol = text.find("\n", pos + 1)
+        if eol == -1:
+            eol = len(text)
+        nxt = text.find("\ndiff --git ", eol)
+        end = nxt if nxt != -1 else len(text)
+        stats.file_count += 1
+
+        _, sep, path = text[pos + 1 : eol].rstrip("\r").rpartition(" b/")
+        if sep and path:
+            stats.files.append(path)
+            # Extended header lines ("new file mode", ...) come before the first hunk
+            hunk = text.find("\n@@", eol, end)
+            if text.find("\nnew file mode", eol, hunk if hunk != -1 else end) != -1:
+                stats.new_files.append(path)
+        pos = nxt
+    return stats
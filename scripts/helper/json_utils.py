@@ -3,6 +3,8 @@ import json
 import re
 from typing import Any, Callable, Optional, TypeVar
 
+from pydantic_core import from_json
+
 T = TypeVar("T")
 
 # Non-greedy, newline-agnostic fence capture (first fenced block only)
@@ -17,26 +19,78 @@ def strip_json_fence(s: str) -> str:
     Remove markdown code fences from JSON content.
     Finds the *first* fenced block. If none, returns stripped input.
     """
+    # Fast path: most answers carry no fence at all, skip the regex scan
+    if "```" not in s:
+        return s.strip()
     m = _JSON_FENCE_RE.search(s)
     if not m:
         return s.strip()
     return m.group(1).strip()
 
 
+class JsonObjectScanner:
+    """
+    Incremental brace matcher for streamed text.
+
+    feed() chunks in order; it returns the offset (within that chunk) just past
+    the `}` that closes the first top-level JSON object, or -1 while the object
+    is still open. Braces inside JSON strings (and escaped quotes) are ignored.
+    """
+
+    __slots__ = ("depth", "in_str", "esc", "done")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_str = False
+        self.esc = False
+        self.done = False
+
+    def feed(self, chunk: str) -> int:
+        if self.done:
+            return 0
+        for i, ch in enumerate(chunk):
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif ch == "\\":
+                    self.esc = True
+                elif ch == '"':
+                    self.in_str = False
+            elif ch == '"':
+                if self.depth:
+                    self.in_str = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    self.done = True
+                    return i + 1
+        return -1
+
+
 def extract_json_object(text: str) -> str:
     """
     Extract the first JSON object likely to be valid.
 
     Strategy:
     1) If a ```json ... ``` fence exists, return its content.
-    2) Else, return substring from first '{' to last '}' (inclusive).
-    3) Else, return stripped original text.
+    2) Else, return the first balanced {...} object (one linear scan, so
+       trailing chatter or a second object after it is dropped).
+    3) Else, if the braces never balance, substring from first '{' to last '}'.
+    4) Else, return stripped original text.
     """
-    m = _JSON_FENCE_RE.search(text)
-    if m:
-        return m.group(1).strip()
+    if "```" in text:
+        m = _JSON_FENCE_RE.search(text)
+        if m:
+            return m.group(1).strip()
 
     start = text.find("{")
+    if start != -1:
+        end = JsonObjectScanner().feed(text[start:])
+        if end != -1:
+            return text[start : start + end]
+
     end = text.rfind("}")
 
     if start != -1 and end != -1 and end > start:
@@ -72,7 +126,7 @@ def try_parse_json(maybe: Any) -> tuple[Optional[Any], Optional[str]]:
     # Double-decoding check (JSON string containing JSON)
     if isinstance(parsed, str):
         s2 = extract_json_object(parsed)
-        s2 = strip_json_fence(s2).strip()
+        s2 = strip_json_fence(s2)  # already stripped
         if (s2.startswith("{") and s2.endswith("}")) or (s2.startswith("[") and s2.endswith("]")):
             try:
                 parsed2 = json.loads(s2)
@@ -97,14 +151,22 @@ def safe_parse_model(
         fallback_factory: Callable that takes the raw string and returns a fallback model instance
 
     Returns:
-        Parsed model instance, or fallback if parsing fails.
+        Parsed model instance (salvaged from a truncated object if needed),
+        or fallback if parsing fails.
     """
     json_str = extract_json_object(raw)
 
     try:
-        data = json.loads(json_str)
-        if not isinstance(data, dict):
-            return fallback_factory(raw)
-        return model_cls(**data)
+        # Pydantic v2 parses and validates in one pass in pydantic-core
+        # (no intermediate dict built by json.loads)
+        return model_cls.model_validate_json(json_str)  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+    try:
+        # Truncated output (token limit, timeout): keep the complete part.
+        # Unfinished trailing strings are dropped, so a half-written field
+        # never gets through; the model still has to validate.
+        return model_cls.model_validate(from_json(json_str, allow_partial=True))  # type: ignore[attr-defined]
     except Exception:
         return fallback_factory(raw)
@@ -0,0 +1,46 @@
+# helper/keys.py
+import os
+import sys
+
+# Platform terminal modules are resolved once, not on every key press
+if os.name == "nt":
+    import msvcrt
+else:
+    import termios
+    import tty
+
+
+def _getch() -> str:
+    """Read one key from the terminal without waiting for Enter."""
+    if os.name == "nt":
+        return msvcrt.getwch()
+
+    fd = sys.stdin.fileno()
+    old = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        return sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+
+def read_key(prompt: str) -> str:
+    """
+    Show prompt and return a single key press, so one-key menus need no Enter.
+    Enter returns "" (the menu default); Ctrl+C raises KeyboardInterrupt.
+    Falls back to input() when stdin/stdout is not a terminal (pipes, tests).
+    """
+    if not (sys.stdin.isatty() and sys.stdout.isatty()):
+        return input(prompt).strip()
+
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    ch = _getch()
+    if ch in ("\x03", "\x04"):
+        sys.stdout.write("\n")
+        raise KeyboardInterrupt
+    if ch in ("\r", "\n"):
+        ch = ""
+    sys.stdout.write(ch + "\n")
+    sys.stdout.flush()
+    return ch
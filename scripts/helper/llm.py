@@ -1,11 +1,43 @@
 # helper/llm.py
+import json
 import os
-from typing import Optional
+import threading
+from functools import lru_cache
+from typing import Any, Generator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .json_utils import JsonObjectScanner
 from .ollama_utils import resolve_ollama_url
 
+# orjson is optional: it decodes the many small NDJSON stream chunks faster
+try:
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _json_loads = json.loads
+
+# One pooled session per process: repeated calls reuse the keep-alive connection.
+# Only one host (Ollama) is ever used; up to 4 sockets are kept for the
+# concurrent callers (warm-up, a generation and its background prefetches).
+# No transport retries: a failed generation must surface, not silently rerun.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+
+def ollama_session() -> requests.Session:
+    """The process-wide pooled session, for helpers that call Ollama directly."""
+    return _SESSION
+
+
+@lru_cache(maxsize=1)
+def ollama_base_url() -> str:
+    """Resolve the Ollama URL once per process (WSL detection shells out to `ip`)."""
+    return resolve_ollama_url("http://localhost:11434")
+
 
 def resolve_model(requested_model: Optional[str] = None) -> str:
     """
@@ -36,6 +68,13 @@ def ollama_chat(
     model: Optional[str] = None,
     temperature: Optional[float] = None,
     top_p: Optional[float] = None,
+    stream: bool = False,
+    keep_alive: Optional[str] = None,
+    seed: Optional[int] = None,
+    format: Optional[Any] = None,
+    num_predict: Optional[int] = None,
+    stop: Optional[list[str]] = None,
+    stop_after_json: bool = False,
 ) -> str:
     """
     Core Ollama chat helper for local tools.
@@ -48,36 +87,171 @@ def ollama_chat(
         model: Model name (uses default if not provided)
         temperature: Sampling temperature (0.0-1.0, lower = more deterministic)
         top_p: Nucleus sampling parameter (0.0-1.0)
+        stream: Consume the NDJSON stream instead of waiting for one buffered
+                JSON body (the result is the same joined string)
+        keep_alive: How long Ollama keeps the model loaded after the call
+                    (e.g. "10m", "1h"); server default if not provided
+        seed: Sampling seed; different seeds give different candidates for
+              the same prompt (the prompt prefix stays cacheable)
+        format: "json" (or a JSON schema dict) to constrain decoding to valid JSON
+        num_predict: Upper bound on generated tokens
+        stop: Sequences that end generation (not included in the result)
+        stop_after_json: With stream=True, hang up as soon as the first top-level
+                         JSON object is complete and return just that object
+                         (trailing chatter is never generated/transferred)
 
     Returns:
       raw content string from the model (no extra cleanup).
     """
-    base_url = resolve_ollama_url("http://localhost:11434")
-    model_name = resolve_model(model)
+    payload = {
+        "model": resolve_model(model),
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "options": _build_options(num_ctx, temperature, top_p, seed, num_predict, stop),
+        "stream": stream,
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if format is not None:
+        payload["format"] = format
+    return _post_ollama("/api/chat", payload, timeout=timeout, stream=stream, stop_after_json=stop_after_json)
+
+
+def ollama_generate(
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    num_ctx: int = 4096,
+    timeout: int = 60,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    top_p: Optional[float] = None,
+    stream: bool = False,
+    keep_alive: Optional[str] = None,
+    seed: Optional[int] = None,
+    format: Optional[Any] = None,
+    num_predict: Optional[int] = None,
+    stop: Optional[list[str]] = None,
+    stop_after_json: bool = False,
+) -> str:
+    """
+    Single-turn variant of ollama_chat using /api/generate.
 
+    For one-shot tools there is no conversation to keep, so the request carries
+    a plain `system` + `prompt` pair instead of a messages array.
+    Arguments and return value are the same as ollama_chat.
+    """
+    payload = {
+        "model": resolve_model(model),
+        "system": system_prompt,
+        "prompt": user_prompt,
+        "options": _build_options(num_ctx, temperature, top_p, seed, num_predict, stop),
+        "stream": stream,
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if format is not None:
+        payload["format"] = format
+    return _post_ollama("/api/generate", payload, timeout=timeout, stream=stream, stop_after_json=stop_after_json)
+
+
+def _build_options(
+    num_ctx: int,
+    temperature: Optional[float],
+    top_p: Optional[float],
+    seed: Optional[int] = None,
+    num_predict: Optional[int] = None,
+    stop: Optional[list[str]] = None,
+) -> dict:
     options: dict = {"num_ctx": num_ctx}
     if temperature is not None:
         options["temperature"] = temperature
     if top_p is not None:
         options["top_p"] = top_p
+    if seed is not None:
+        options["seed"] = seed
+    if num_predict is not None:
+        options["num_predict"] = num_predict
+    if stop:
+        options["stop"] = stop
+    return options
 
-    payload = {
-        "model": model_name,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "options": options,
-        "stream": False,
-    }
 
-    resp = requests.post(
-        f"{base_url}/api/chat",
+def _post_ollama(path: str, payload: dict, *, timeout: int, stream: bool, stop_after_json: bool = False) -> str:
+    resp = _SESSION.post(
+        f"{ollama_base_url()}{path}",
         json=payload,
         timeout=timeout,
+        stream=stream,
     )
     resp.raise_for_status()
+    if stream:
+        if stop_after_json:
+            return _read_json_object(iter_stream_content(resp))
+        # Collect pieces and join once (avoids quadratic str concatenation).
+        return "".join(iter_stream_content(resp))
     data = resp.json()
-    return data["message"]["content"]
+    if "message" in data:
+        return data["message"]["content"]
+    return data["response"]
+
+
+def _read_json_object(pieces: Generator[str, None, None]) -> str:
+    """
+    Join streamed pieces until the first top-level JSON object closes, then stop
+    (closing the generator closes the HTTP response). Falls back to the whole
+    text if no object ever completes.
+    """
+    scanner = JsonObjectScanner()
+    parts: list[str] = []
+    for piece in pieces:
+        end = scanner.feed(piece)
+        if end != -1:
+            parts.append(piece[:end])
+            pieces.close()
+            break
+        parts.append(piece)
+    return "".join(parts)
+
+
+def warm_model(model: Optional[str] = None, *, keep_alive: str = "10m") -> None:
+    """
+    Ask Ollama to load the model in the background (empty /api/generate request),
+    so the weights are resident by the time the real prompt is sent.
+    Best-effort: failures are ignored, the real call reports them.
+    """
+    base_url = ollama_base_url()
+    payload = {"model": resolve_model(model), "keep_alive": keep_alive}
+
+    def _warm() -> None:
+        try:
+            _SESSION.post(f"{base_url}/api/generate", json=payload, timeout=60)
+        except Exception:
+            pass
+
+    threading.Thread(target=_warm, daemon=True).start()
+
+
+def iter_stream_content(resp: requests.Response) -> Generator[str, None, None]:
+    """
+    Yield content deltas from a streaming Ollama response (one JSON object per line).
+    Stops at the chunk marked "done" and closes the response.
+    """
+    try:
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            chunk = _json_loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+            piece = (chunk.get("message") or {}).get("content") or chunk.get("response") or ""
+            if piece:
+                yield piece
+            if chunk.get("done"):
+                break
+    finally:
+        resp.close()
 
 
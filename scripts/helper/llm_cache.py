@@ -0,0 +1,189 @@
+# helper/llm_cache.py
+"""
+Exact-match cache for raw LLM answers, shared by the local tools.
+
+Entries live in one SQLite file (~/.cache/ai-tools/llm.db by default,
+override with LLM_CACHE_PATH; LLM_CACHE=0 disables the cache), with a small
+in-process LRU in front of it for long-running callers. Every hit is counted;
+once the file holds more than LLM_CACHE_MAX_ENTRIES rows, the least-hit
+quarter (oldest first) is evicted.
+
+Keys are hashes of everything that shapes the answer (prompts, model,
+options), so a changed prompt or model is simply a miss. All operations are
+best-effort: a broken or locked cache behaves like an empty one.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .env import env_bool, env_int
+
+# blake3 is optional: it hashes the long prompt parts faster than blake2b.
+# Both give 128-bit keys; switching backends only turns old entries into misses.
+try:
+    from blake3 import blake3 as _blake3  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    _blake3 = None
+
+CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", Path.home() / ".cache" / "ai-tools" / "llm.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key      TEXT PRIMARY KEY,
+    model    TEXT NOT NULL,
+    response TEXT NOT NULL,
+    ts       INTEGER NOT NULL,
+    hits     INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+# One connection per process, shared by the prefetch threads (guarded by _LOCK)
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[Path] = None
+
+# Recently used entries, kept in process so repeat lookups skip SQLite.
+# LRU order: hits move to the end, the front entry is evicted when full.
+_MEMO_SIZE = 256
+_memo: "OrderedDict[str, tuple[str, int]]" = OrderedDict()
+
+# Hits not yet written to the file. Memo hits only bump these, so a hot
+# entry costs no write per lookup; they are flushed with the next write.
+_pending_hits: dict[str, int] = {}
+
+
+def enabled() -> bool:
+    return env_bool("LLM_CACHE", "1")
+
+
+def max_entries() -> int:
+    return env_int("LLM_CACHE_MAX_ENTRIES", 5000)
+
+
+def cache_key(*parts: str) -> str:
+    """Stable key for the given prompt/model/option parts (NUL-separated)."""
+    data = ("\0".join(parts) + "\0").encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(data).hexdigest(16)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _connection() -> sqlite3.Connection:
+    global _conn, _conn_path
+    if _conn is None or _conn_path != CACHE_PATH:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        # WAL: concurrent tool processes read while one writes, and a store
+        # needs no fsync per commit (NORMAL is durable enough for a cache)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(llm_cache)")}
+        if "hits" not in columns:  # cache file from before hit counting
+            conn.execute("ALTER TABLE llm_cache ADD COLUMN hits INTEGER NOT NULL DEFAULT 0")
+        _conn, _conn_path = conn, CACHE_PATH
+        _memo.clear()
+        _pending_hits.clear()
+    return _conn
+
+
+def _remember(key: str, entry: tuple[str, int]) -> None:
+    _memo[key] = entry
+    _memo.move_to_end(key)
+    while len(_memo) > _MEMO_SIZE:
+        _memo.popitem(last=False)
+
+
+def _flush_hits(conn: sqlite3.Connection) -> None:
+    """Write the pending hit counts (the caller commits)."""
+    if _pending_hits:
+        conn.executemany(
+            "UPDATE llm_cache SET hits = hits + ? WHERE key = ?",
+            [(n, key) for key, n in _pending_hits.items()],
+        )
+        _pending_hits.clear()
+
+
+@atexit.register
+def _flush_hits_at_exit() -> None:
+    try:
+        with _LOCK:
+            if _conn is not None and _pending_hits:
+                _flush_hits(_conn)
+                _conn.commit()
+    except sqlite3.Error:
+        pass  # cache is best-effort
+
+
+def _evict(conn: sqlite3.Connection) -> None:
+    """Past max_entries rows, drop the least-hit 25% (oldest first among equals)."""
+    limit = max_entries()
+    count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+    if count <= limit:
+        return
+    victims = [
+        key for (key,) in conn.execute(
+            "SELECT key FROM llm_cache ORDER BY hits, ts LIMIT ?", (max(count // 4, count - limit),)
+        )
+    ]
+    conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(key,) for key in victims])
+    for key in victims:
+        _memo.pop(key, None)
+
+
+def lookup(key: str, max_age: Optional[int] = None) -> Optional[str]:
+    """
+    Cached response for key, or None (missing, older than max_age seconds, or cache unusable).
+    Every hit is counted (memo hits included), so eviction keeps the entries that get reused.
+    """
+    if not enabled():
+        return None
+    try:
+        with _LOCK:
+            conn = _connection()
+            row = _memo.get(key)
+            from_file = row is None
+            if from_file:
+                row = conn.execute(
+                    "SELECT response, ts FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None or (max_age is not None and time.time() - row[1] > max_age):
+                return None
+            _pending_hits[key] = _pending_hits.get(key, 0) + 1
+            if from_file:
+                _remember(key, row)
+                _flush_hits(conn)  # already paying for a file read
+                conn.commit()
+            else:
+                _memo.move_to_end(key)
+    except (OSError, sqlite3.Error):
+        return None
+    return row[0]
+
+
+def store(key: str, response: str, model: str = "") -> None:
+    """Store (or refresh) the response for key."""
+    if not enabled():
+        return
+    try:
+        with _LOCK:
+            conn = _connection()
+            _flush_hits(conn)
+            ts = int(time.time())
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, ts) VALUES (?, ?, ?, ?)",
+                (key, model, response, ts),
+            )
+            _evict(conn)
+            conn.commit()
+            _remember(key, (response, ts))
+    except (OSError, sqlite3.Error):
+        pass  # cache is best-effort
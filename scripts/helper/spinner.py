@@ -1,31 +1,49 @@
 # helper/spinner.py
+import os
+import signal
 import sys
 import threading
-import time
-from typing import Callable, TypeVar
+from typing import Any, Callable, TypeVar
 
 T = TypeVar("T")
 
+_SYMBOLS = "|/-\\"
+_INTERVAL = 0.1
 
-def with_spinner(label: str, fn: Callable[[], T]) -> T:
-    """Run fn() while showing a small spinner on stderr."""
-    stop_flag = {"stop": False}
 
-    def spinner():
-        symbols = "|/-\\"
-        idx = 0
-        while not stop_flag["stop"]:
-            sys.stderr.write(f"\r[{label}] " + symbols[idx % 4])
-            sys.stderr.flush()
-            idx += 1
-            time.sleep(0.1)
-        sys.stderr.write(f"\r[{label}] done   \n")
-        sys.stderr.flush()
+def with_spinner(label: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run fn(*args, **kwargs) while showing a small spinner on stderr.
+    Arguments are forwarded, so callers need no closure or lambda around fn.
+
+    The spinner is driven by a SIGALRM interval timer instead of a helper thread,
+    so nothing wakes up to contend for the GIL while fn() waits on the model.
+    Ticks are written straight to fd 2, never through sys.stderr, so fn() may print.
+    Without SIGALRM (Windows) or off the main thread, fn() runs without a spinner.
+    """
+    if os.name == "nt" or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        return fn(*args, **kwargs)
+
+    idx = 0
+    prefix = f"\r[{label}] ".encode()
 
-    thread = threading.Thread(target=spinner, daemon=True)
-    thread.start()
+    def _tick(_signum, _frame) -> None:
+        # Raw write to fd 2: the handler may interrupt fn() mid-write to sys.stderr,
+        # and re-entering that buffered stream from a signal handler raises
+        nonlocal idx
+        try:
+            os.write(2, prefix + _SYMBOLS[idx % 4].encode())
+        except OSError:
+            pass
+        idx += 1
+
+    sys.stderr.flush()  # keep earlier buffered output ahead of the first tick
+    prev_handler = signal.signal(signal.SIGALRM, _tick)
+    signal.setitimer(signal.ITIMER_REAL, _INTERVAL, _INTERVAL)
     try:
-        return fn()
+        return fn(*args, **kwargs)
     finally:
-        stop_flag["stop"] = True
-        thread.join()
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev_handler)
+        sys.stderr.write(f"\r[{label}] done   \n")
+        sys.stderr.flush()
@@ -5,15 +5,20 @@ import base64
 import io
 import os
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
 import requests
 from PIL import Image
 
+from .llm import ollama_session
 from .ollama_utils import resolve_ollama_url
 from .ui import UI
 
+# Same pooled keep-alive session as the text helpers (batches/retries reuse one socket)
+_SESSION = ollama_session()
+
 # =============================================================================
 # Paths
 # =============================================================================
@@ -100,21 +105,14 @@ def _encode_jpeg_bytes(im: Image.Image, quality: int) -> bytes:
     return buf.getvalue()
 
 
-def _encode_jpeg_b64(im: Image.Image, quality: int) -> str:
-    return base64.b64encode(_encode_jpeg_bytes(im, quality)).decode("utf-8")
-
-
+@lru_cache(maxsize=1)
 def _debug_dir() -> Path:
+    """Debug image directory, created on first use only (not per request/image)."""
     d = BASE_DIR / "logs" / "vlm-images"
     d.mkdir(parents=True, exist_ok=True)
     return d
 
 
-def _save_debug_jpeg(panel: Image.Image, out_path: Path, quality: int) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_bytes(_encode_jpeg_bytes(panel, quality))
-
-
 def _snap_size(w: int, h: int, *, snap_mult: int, snap_min: int) -> tuple[int, int]:
     """
     Snap down to stable multiples to avoid backend tiling/assert paths.
@@ -181,14 +179,13 @@ def _prepare_images_for_vlm(
         w, h = panel.size
         sizes.append((w, h))
 
+        # Encoded once: the debug copy is the exact bytes the model receives
+        jpeg = _encode_jpeg_bytes(panel, quality=jpeg_quality)
         if debug_dir is not None:
-            _save_debug_jpeg(
-                panel,
-                debug_dir / f"{debug_save_prefix}__{p.stem}__i{idx}__{w}x{h}.jpg",
-                quality=jpeg_quality,
-            )
+            # debug_dir already exists (_debug_dir creates it)
+            (debug_dir / f"{debug_save_prefix}__{p.stem}__i{idx}__{w}x{h}.jpg").write_bytes(jpeg)
 
-        images_b64.append(_encode_jpeg_b64(panel, quality=jpeg_quality))
+        images_b64.append(base64.b64encode(jpeg).decode("ascii"))
 
     return images_b64, sizes
 
@@ -220,7 +217,7 @@ def _looks_like_template_leak(content: str) -> bool:
 def _probe_ollama(base_url: str) -> str:
     # Debug-only helper; keep lightweight.
     try:
-        r = requests.get(f"{base_url}/api/version", timeout=5)
+        r = _SESSION.get(f"{base_url}/api/version", timeout=5)
         r.raise_for_status()
         return r.text.strip()
     except Exception as e:
@@ -343,7 +340,7 @@ def ollama_chat_with_images(
 
         t0 = time.time()
         with ui.status("[vlm] calling Ollama /api/chat ..."):
-            r = requests.post(f"{base_url}/api/chat", json=payload, timeout=timeout)
+            r = _SESSION.post(f"{base_url}/api/chat", json=payload, timeout=timeout)
         dt = int((time.time() - t0) * 1000)
 
         r.raise_for_status()
@@ -370,7 +367,7 @@ def ollama_chat_with_images(
 
         t0 = time.time()
         with ui.status("[vlm] calling Ollama /api/generate ..."):
-            r = requests.post(f"{base_url}/api/generate", json=payload, timeout=timeout)
+            r = _SESSION.post(f"{base_url}/api/generate", json=payload, timeout=timeout)
         dt = int((time.time() - t0) * 1000)
 
         r.raise_for_status()
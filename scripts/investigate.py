@@ -7,7 +7,7 @@ from textwrap import dedent
 from .helper.llm import ollama_chat
 from .helper.json_utils import strip_json_fence
 from .helper.spinner import with_spinner
-from .helper.context import warn_if_approaching_context
+from .helper.context import warn_if_approaching_context, fit_num_ctx
 from .helper.env import load_repo_dotenv
 from .helper.colors import Colors
 load_repo_dotenv()
@@ -145,60 +145,66 @@ def read_logs(lines_needed: int, path: str | None) -> str:
 # ---------------------------------------------------------------------------
 
 
-def build_system_prompt(mode: str) -> str:
-    if mode == "summary":
-        return dedent(
-            """
-            You are a precise log summarization assistant.
-
-            Your goals:
-              - Provide a high-level summary of what these logs show.
-              - Highlight key events, errors, warnings, and time ranges.
-              - Group related messages into a few clear bullet points.
-              - Mention the most important error(s) and their impact.
-
-            Do not:
-              - Invent logs or details that are not present.
-              - Over-quote; prefer short snippets or line ranges.
-            """
-        ).strip()
-
-    if mode == "blame":
-        return dedent(
-            """
-            You are a precise debugging assistant focusing on responsibility ("blame").
-
-            Your goals:
-              - Identify the most likely component, service, module, or change
-                that is responsible for the error(s) in these logs.
-              - Quote 5-15 highly relevant lines to support your conclusion.
-              - Explain why this component is likely at fault.
-              - Suggest concrete next steps (e.g., which file/endpoint/config
-                to inspect, or which team/owner should look).
-
-            Do not:
-              - Invent logs or stack traces that do not exist.
-              - Accuse people; focus on code, services, or configuration.
-            """
-        ).strip()
+_SUMMARY_SYSTEM_PROMPT = dedent(
+    """
+    You are a precise log summarization assistant.
 
-    # default: "debug"
-    return dedent(
-        """
-        You are a precise debugging assistant analyzing logs.
+    Your goals:
+      - Provide a high-level summary of what these logs show.
+      - Highlight key events, errors, warnings, and time ranges.
+      - Group related messages into a few clear bullet points.
+      - Mention the most important error(s) and their impact.
+
+    Do not:
+      - Invent logs or details that are not present.
+      - Over-quote; prefer short snippets or line ranges.
+    """
+).strip()
+
+_BLAME_SYSTEM_PROMPT = dedent(
+    """
+    You are a precise debugging assistant focusing on responsibility ("blame").
+
+    Your goals:
+      - Identify the most likely component, service, module, or change
+        that is responsible for the error(s) in these logs.
+      - Quote 5-15 highly relevant lines to support your conclusion.
+      - Explain why this component is likely at fault.
+      - Suggest concrete next steps (e.g., which file/endpoint/config
+        to inspect, or which team/owner should look).
+
+    Do not:
+      - Invent logs or stack traces that do not exist.
+      - Accuse people; focus on code, services, or configuration.
+    """
+).strip()
+
+_DEBUG_SYSTEM_PROMPT = dedent(
+    """
+    You are a precise debugging assistant analyzing logs.
+
+    Your goals:
+      - Identify the primary error(s) or failure mode(s).
+      - Quote 10-20 relevant lines only (no giant dumps).
+      - Explain likely root cause(s) in plain language.
+      - Suggest concrete, actionable next steps or commands
+        (e.g., tests to run, files to inspect, config to check).
+
+    Do not:
+      - Invent logs or details that do not exist.
+      - Provide generic advice that ignores the actual log content.
+    """
+).strip()
 
-        Your goals:
-          - Identify the primary error(s) or failure mode(s).
-          - Quote 10-20 relevant lines only (no giant dumps).
-          - Explain likely root cause(s) in plain language.
-          - Suggest concrete, actionable next steps or commands
-            (e.g., tests to run, files to inspect, config to check).
+_SYSTEM_PROMPTS = {
+    "summary": _SUMMARY_SYSTEM_PROMPT,
+    "blame": _BLAME_SYSTEM_PROMPT,
+}
 
-        Do not:
-          - Invent logs or details that do not exist.
-          - Provide generic advice that ignores the actual log content.
-        """
-    ).strip()
+
+def build_system_prompt(mode: str) -> str:
+    # default: "debug"
+    return _SYSTEM_PROMPTS.get(mode, _DEBUG_SYSTEM_PROMPT)
 
 
 def build_prompts(logs: str, mode: str) -> tuple[str, str]:
@@ -218,7 +224,7 @@ def call_model(system_prompt: str, user_prompt: str) -> str:
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             model=os.getenv("INVESTIGATE_MODEL"),
-            num_ctx=16000,
+            num_ctx=fit_num_ctx(system_prompt, user_prompt, response_tokens=2048, max_ctx=16000),
             timeout=120,
         )
         return strip_json_fence(raw)
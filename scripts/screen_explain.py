@@ -297,38 +297,44 @@ def _cache_paths(ck: str) -> Tuple[Path, Path]:
 # LLM & Prompting
 # -----------------------------------------------------------------------------
 
+_SYSTEM_PROMPT = dedent(
+    """
+    You are an expert UI/UX developer and QA engineer.
+
+    Output ONLY valid JSON. No markdown, no code fences, no explanations.
+
+    Requirements:
+    - status must be one of: "visible", "hidden", "disabled"
+    - severity must be one of: "low", "medium", "high", "critical"
+    - Every ui_elements item MUST include "name" and "description"
+
+    Output format (example shape, not literal):
+    {
+        "summary": "string",
+        "ui_elements": [
+            { "name": "string", "description": "string", "status": "visible"|"hidden"|"disabled" }
+        ],
+        "detected_text": ["string"],
+        "issues": [
+            { "title": "string", "severity": "low"|"medium"|"high"|"critical", "description": "string", "recommendation": "string" }
+        ],
+        "next_checks": ["string"]
+    }
+    """
+).strip()
+
+
 def build_system_prompt() -> str:
-    return dedent("""
-        You are an expert UI/UX developer and QA engineer.
-
-        Output ONLY valid JSON. No markdown, no code fences, no explanations.
-
-        Requirements:
-        - status must be one of: "visible", "hidden", "disabled"
-        - severity must be one of: "low", "medium", "high", "critical"
-        - Every ui_elements item MUST include "name" and "description"
-
-        Output format (example shape, not literal):
-        {
-            "summary": "string",
-            "ui_elements": [
-                { "name": "string", "description": "string", "status": "visible"|"hidden"|"disabled" }
-            ],
-            "detected_text": ["string"],
-            "issues": [
-                { "title": "string", "severity": "low"|"medium"|"high"|"critical", "description": "string", "recommendation": "string" }
-            ],
-            "next_checks": ["string"]
-        }
-    """).strip()
+    return _SYSTEM_PROMPT
 
 
 def build_user_prompt(n: int) -> str:
-    return dedent(f"""
-        Analyze the provided {n} screenshot(s).
-
-        Summarize what is shown, list key UI elements, detect visible errors or odd states, and suggest what a developer should check next.
-    """).strip()
+    return (
+        f"Analyze the provided {n} screenshot(s).\n"
+        "\n"
+        "Summarize what is shown, list key UI elements, detect visible errors or odd states, "
+        "and suggest what a developer should check next."
+    )
 
 
 def _make_fallback_analysis(raw: str) -> ScreenAnalysis:
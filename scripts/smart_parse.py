@@ -46,6 +46,7 @@ from textwrap import dedent
 from .helper.llm import ollama_chat
 from .helper.spinner import with_spinner
 from .helper.env import load_repo_dotenv
+from .helper.context import fit_num_ctx, estimate_tokens
 from .helper.colors import Colors
 load_repo_dotenv()
 
@@ -207,6 +208,34 @@ def compute_output_path(
     return (PARSED_DIR / f"smart_parse-{ts}{ext}").resolve()
 
 
+_SYSTEM_PROMPT = dedent(
+    """
+    You repair arbitrary text with minimal changes.
+
+    Input may be:
+      - code (any language),
+      - JSON / arrays / objects,
+      - configs (YAML, TOML, INI),
+      - Markdown, tables, comments, logs, etc.
+
+    Your job:
+      - Fix obvious syntax / structural problems:
+          - close brackets / braces / quotes
+          - fix clearly invalid trailing commas
+          - balance parentheses
+          - complete obviously truncated structures
+      - Preserve the existing format and language.
+        Do NOT convert plain text into JSON or YAML.
+        Do NOT wrap the content inside new containers.
+        Do NOT add metadata or commentary.
+
+    Output:
+      - Return ONLY the fixed content.
+      - No explanations, no markdown fences, no backticks.
+    """
+).strip()
+
+
 def call_model(snippet: str) -> str:
     """
     Ask the local model to minimally repair the snippet,
@@ -214,32 +243,7 @@ def call_model(snippet: str) -> str:
     """
     model = os.getenv("SMART_PARSE_MODEL")
 
-    system_prompt = dedent(
-        """
-        You repair arbitrary text with minimal changes.
-
-        Input may be:
-          - code (any language),
-          - JSON / arrays / objects,
-          - configs (YAML, TOML, INI),
-          - Markdown, tables, comments, logs, etc.
-
-        Your job:
-          - Fix obvious syntax / structural problems:
-              - close brackets / braces / quotes
-              - fix clearly invalid trailing commas
-              - balance parentheses
-              - complete obviously truncated structures
-          - Preserve the existing format and language.
-            Do NOT convert plain text into JSON or YAML.
-            Do NOT wrap the content inside new containers.
-            Do NOT add metadata or commentary.
-
-        Output:
-          - Return ONLY the fixed content.
-          - No explanations, no markdown fences, no backticks.
-        """
-    ).strip()
+    system_prompt = _SYSTEM_PROMPT
 
     user_prompt = f"Repair this snippet while preserving its format:\n\n{snippet}"
 
@@ -250,7 +254,13 @@ def call_model(snippet: str) -> str:
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 model=model,
-                num_ctx=16000,
+                # The repaired snippet is about as long as the input
+                num_ctx=fit_num_ctx(
+                    system_prompt,
+                    user_prompt,
+                    response_tokens=estimate_tokens(snippet) + 256,
+                    max_ctx=16000,
+                ),
                 timeout=180
             )
         )
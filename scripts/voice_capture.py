@@ -31,11 +31,14 @@ import sys
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, Any
 
 from .helper.colors import Colors
 
-from faster_whisper import WhisperModel
+if TYPE_CHECKING:
+    # Imported in _get_model: faster-whisper pulls in ctranslate2/onnxruntime,
+    # which costs seconds before --help or argument errors can even print
+    from faster_whisper import WhisperModel
 
 _PUNCT_RE = re.compile(r"[^\w\s']+", re.UNICODE)  # keep apostrophes in contractions
 
@@ -63,6 +66,8 @@ def _get_model(model_name: str, device: str, compute_type: str) -> WhisperModel:
     global _model_singleton, _model_sig
     sig = (model_name, device, compute_type)
     if _model_singleton is None or _model_sig != sig:
+        from faster_whisper import WhisperModel
+
         _model_singleton = WhisperModel(model_name, device=device, compute_type=compute_type)
         _model_sig = sig
     return _model_singleton
@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -220,7 +221,10 @@ async def english_teach(payload: TeachIn, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Missing 'chat_key'")
 
     try:
-        out = teach(text=text, mode=mode)
+        # teach() blocks on Ollama; run it off the event loop so concurrent
+        # requests reach Ollama together (it batches them with OLLAMA_NUM_PARALLEL)
+        # instead of queueing behind one another here
+        out = await run_in_threadpool(teach, text=text, mode=mode)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"english-teacher failed: {type(e).__name__}: {e}")
 
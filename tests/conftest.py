@@ -5,6 +5,12 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Keep the LLM response cache out of ~/.cache and empty for every test."""
+    monkeypatch.setattr("scripts.helper.llm_cache.CACHE_PATH", tmp_path / "llm.db")
+
+
 @pytest.fixture
 def mock_ollama_response():
     """Factory fixture for mocking Ollama API responses."""
@@ -16,7 +22,7 @@ def mock_ollama_response():
 @pytest.fixture
 def mock_ollama_chat(mock_ollama_response):
     """Mock the ollama_chat function from helper/llm.py."""
-    with patch("scripts.helper.llm.requests.post") as mock_post:
+    with patch("scripts.helper.llm._SESSION.post") as mock_post:
         mock_resp = MagicMock()
         mock_resp.json.return_value = mock_ollama_response("Mocked LLM response")
         mock_resp.raise_for_status = MagicMock()
@@ -9,7 +9,7 @@ from scripts.ai_commit import CommitData, CommitFile
 class TestGenerateCommit:
     """Tests for the generate_commit function with mocked LLM."""
 
-    @patch("scripts.ai_commit.ollama_chat")
+    @patch("scripts.ai_commit.ollama_generate")
     def test_generate_commit_valid_response(self, mock_ollama):
         """generate_commit should parse valid LLM JSON response."""
         from scripts.ai_commit import generate_commit, CommitCfg
@@ -31,8 +31,29 @@ class TestGenerateCommit:
         assert len(result.bullets) == 2
         assert result.bullets[0].path == "auth.py"
         assert not result.is_error
+        assert mock_ollama.call_args.kwargs["format"] == "json"
+        # One file: room for summary, alternatives and a bullet, not more
+        assert mock_ollama.call_args.kwargs["num_predict"] == 240
 
-    @patch("scripts.ai_commit.ollama_chat")
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_generate_commit_lists_files_without_bullet(self, mock_ollama):
+        """Changed files the model skipped should be reported, not invented."""
+        from scripts.ai_commit import generate_commit, CommitCfg
+
+        mock_ollama.return_value = json.dumps({
+            "summary": "Add login",
+            "bullets": [{"path": "auth.py", "explanation": "Added login"}]
+        })
+        diff = (
+            "diff --git a/auth.py b/auth.py\n+def login(): pass\n"
+            "diff --git a/routes.py b/routes.py\n+route()\n"
+        )
+
+        result = generate_commit(diff, CommitCfg())
+
+        assert result.missing_files == ["routes.py"]
+
+    @patch("scripts.ai_commit.ollama_generate")
     def test_generate_commit_with_markdown_fence(self, mock_ollama):
         """generate_commit should handle markdown-wrapped JSON."""
         from scripts.ai_commit import generate_commit, CommitCfg
@@ -50,7 +71,7 @@ class TestGenerateCommit:
         assert result.summary == "Fix bug in parser"
         assert not result.is_error
 
-    @patch("scripts.ai_commit.ollama_chat")
+    @patch("scripts.ai_commit.ollama_generate")
     def test_generate_commit_handles_llm_error(self, mock_ollama):
         """generate_commit should return error state on LLM failure."""
         from scripts.ai_commit import generate_commit, CommitCfg
@@ -63,7 +84,7 @@ class TestGenerateCommit:
         assert result.is_error is True
         assert "Network error" in result.raw_output
 
-    @patch("scripts.ai_commit.ollama_chat")
+    @patch("scripts.ai_commit.ollama_generate")
     def test_generate_commit_handles_invalid_json(self, mock_ollama):
         """generate_commit should handle invalid JSON gracefully."""
         from scripts.ai_commit import generate_commit, CommitCfg
@@ -75,7 +96,7 @@ class TestGenerateCommit:
 
         assert result.is_error is True
 
-    @patch("scripts.ai_commit.ollama_chat")
+    @patch("scripts.ai_commit.ollama_generate")
     def test_generate_commit_alias_handling(self, mock_ollama):
         """generate_commit should handle 'title' alias for 'summary'."""
         from scripts.ai_commit import generate_commit, CommitCfg
@@ -92,6 +113,72 @@ class TestGenerateCommit:
         assert result.summary == "Update README"
         assert not result.is_error
 
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_generate_commit_strips_meta_prefix(self, mock_ollama):
+        """generate_commit should drop meta preambles and quotes from the summary."""
+        from scripts.ai_commit import generate_commit, CommitCfg
+
+        mock_ollama.return_value = json.dumps({
+            "summary": "Commit message: \"Add retry backoff\"",
+            "bullets": []
+        })
+
+        result = generate_commit("dummy diff", CommitCfg())
+
+        assert result.summary == "Add retry backoff"
+
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_generate_commit_keeps_distinct_alternatives(self, mock_ollama):
+        """generate_commit should keep alternative summaries that differ from the summary."""
+        from scripts.ai_commit import generate_commit, CommitCfg
+
+        mock_ollama.return_value = json.dumps({
+            "summary": "Add retry backoff",
+            "bullets": [],
+            "alternatives": ["Add retry backoff", "Retry failed requests with backoff", ""]
+        })
+
+        result = generate_commit("dummy diff", CommitCfg())
+
+        assert result.alternatives == ["Retry failed requests with backoff"]
+
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_regeneration_varies_seed_and_temperature(self, mock_ollama):
+        """Regenerations should sample a new seed at a higher temperature."""
+        from scripts.ai_commit import generate_commit, CommitCfg
+
+        mock_ollama.return_value = json.dumps({"summary": "Add retry backoff", "bullets": []})
+
+        generate_commit("dummy diff", CommitCfg(), variant=2)
+
+        kwargs = mock_ollama.call_args.kwargs
+        assert kwargs["seed"] == 2
+        assert kwargs["temperature"] > CommitCfg().temperature
+
+
+class TestParaphraseSummary:
+    """Tests for the short paraphrase call (no diff in the prompt)."""
+
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_paraphrase_sends_only_summary(self, mock_ollama):
+        from scripts.ai_commit import paraphrase_summary, CommitCfg
+
+        mock_ollama.return_value = "Summary: Retry failed requests with backoff\nextra"
+
+        result = paraphrase_summary("Add retry backoff", CommitCfg())
+
+        assert result == "Retry failed requests with backoff"
+        assert mock_ollama.call_args.kwargs["user_prompt"] == "Add retry backoff"
+        assert mock_ollama.call_args.kwargs["stop"] == ["\n"]
+
+    @patch("scripts.ai_commit.ollama_generate")
+    def test_paraphrase_rejects_echo(self, mock_ollama):
+        from scripts.ai_commit import paraphrase_summary, CommitCfg
+
+        mock_ollama.return_value = "Add retry backoff"
+
+        assert paraphrase_summary("Add retry backoff", CommitCfg()) is None
+
 
 class TestMainRetry:
     """Tests for the main execution flow and retry logic."""
@@ -120,13 +207,15 @@ class TestMainRetry:
         )
         
         with patch("scripts.ai_commit.get_git_diff", return_value=mock_diff), \
-             patch("scripts.ai_commit.with_spinner", side_effect=lambda msg, func: func()), \
+             patch("scripts.ai_commit.warm_model"), \
+             patch("scripts.ai_commit.with_spinner", side_effect=lambda msg, func, *args, **kwargs: func(*args, **kwargs)), \
              patch("scripts.ai_commit.generate_commit", side_effect=[error_data, success_data]) as mock_generate, \
              patch("builtins.input", side_effect=['x', '6']), \
-             patch("scripts.ai_commit.run_git_cmd"), \
+             patch("scripts.ai_commit.git_status"), \
              patch("scripts.ai_commit.push_with_upstream_if_needed"), \
              patch("subprocess.run"), \
              patch("sys.argv", ["ai_commit"]), \
+             patch("scripts.ai_commit.env_bool", return_value=False), \
              patch("sys.exit"):
              
              main()
@@ -33,6 +33,7 @@ class TestTeachFunction:
         assert len(result.mistakes) == 1
         assert result.mistakes[0].why == "Missing infinitive 'to'"
         mock_ollama.assert_called_once()
+        assert mock_ollama.call_args.kwargs["stop_after_json"] is True
 
     @patch("scripts.english_teacher.ollama_chat")
     def test_teach_handles_llm_error(self, mock_ollama):
@@ -59,3 +60,66 @@ class TestTeachFunction:
         call_args = mock_ollama.call_args
         assert call_args is not None
         assert "system_prompt" in call_args.kwargs or len(call_args.args) >= 1
+
+    @patch("scripts.english_teacher.ollama_chat")
+    def test_teach_replays_cached_answer(self, mock_ollama):
+        """A repeated utterance should be answered from the LLM cache."""
+        from scripts.english_teacher import teach
+
+        mock_ollama.return_value = '{"reply": "ok"}'
+
+        first = teach("hello there", mode="coach")
+        second = teach("hello there", mode="coach")
+
+        assert second.reply == first.reply == "ok"
+        mock_ollama.assert_called_once()
+
+    @patch("scripts.english_teacher.ollama_chat")
+    def test_teach_trims_whitespace_while_parsing(self, mock_ollama):
+        """Padding from the model is removed once, on the parsed fields."""
+        from scripts.english_teacher import teach
+
+        mock_ollama.return_value = json.dumps({
+            "reply": "  Nice!\n",
+            "mistakes": [{"frm": " a ", "to": "b\n", "why": " c"}],
+        })
+
+        result = teach("padded answer", mode="coach")
+
+        assert result.reply == "Nice!"
+        assert (result.mistakes[0].frm, result.mistakes[0].to, result.mistakes[0].why) == ("a", "b", "c")
+
+    @patch("scripts.english_teacher.ollama_chat")
+    def test_cache_ignores_spacing_but_not_case(self, mock_ollama):
+        """Respaced takes share a cache entry; a different casing is a new input."""
+        from scripts.english_teacher import teach
+
+        mock_ollama.return_value = '{"reply": "ok"}'
+
+        teach("How are you", mode="coach")
+        second = teach("  How  are\nyou ", mode="coach")
+
+        assert second.reply == "ok"
+        mock_ollama.assert_called_once()
+
+        teach("how are you", mode="coach")
+        assert mock_ollama.call_count == 2
+
+
+class TestMain:
+    """Tests for the CLI entry point."""
+
+    @patch("scripts.english_teacher.ollama_chat")
+    def test_json_flag_prints_model_as_json(self, mock_ollama, capsys):
+        """--json should print the parsed answer as a JSON object."""
+        from scripts.english_teacher import main
+
+        mock_ollama.return_value = '{"reply": "Schön!"}'
+
+        with patch("sys.argv", ["english-teacher", "--json", "hello"]), \
+             patch("sys.stdin.isatty", return_value=True):
+            main()
+
+        printed = json.loads(capsys.readouterr().out)
+        assert printed["reply"] == "Schön!"
+        assert printed["raw_error"] is False
@@ -0,0 +1,93 @@
+# tests/integration/test_explain.py
+"""Integration tests for scripts/explain.py."""
+
+from unittest.mock import patch
+
+
+class TestCallModel:
+    """Tests for call_model() with mocked LLM."""
+
+    @patch("scripts.explain.ollama_chat", return_value="It adds a retry.")
+    def test_repeated_input_is_answered_from_cache(self, mock_ollama):
+        """The same prompts should reach the model only once."""
+        from scripts.explain import call_model
+
+        first = call_model("system", "diff text", "explain")
+        second = call_model("system", "diff text", "explain")
+
+        assert first == second == "It adds a retry."
+        mock_ollama.assert_called_once()
+
+    @patch("scripts.explain.ollama_chat", return_value="answer")
+    def test_no_cache_asks_the_model_again(self, mock_ollama):
+        """use_cache=False should skip the cached answer."""
+        from scripts.explain import KEEP_ALIVE, call_model
+
+        call_model("system", "log text", "explain")
+        call_model("system", "log text", "explain", use_cache=False)
+
+        assert mock_ollama.call_count == 2
+        assert mock_ollama.call_args.kwargs["keep_alive"] == KEEP_ALIVE
+
+
+class TestParseArgs:
+    def test_no_cache_flag(self):
+        from scripts.explain import parse_args
+
+        assert parse_args(["--no-cache", "some.log"]) == ("auto", False, "some.log", False)
+
+
+class TestReadTextTail:
+    def test_small_file_is_read_whole(self, tmp_path):
+        from scripts.explain import read_text_tail
+
+        p = tmp_path / "small.log"
+        p.write_text("one\ntwo\n")
+        assert read_text_tail(p) == "one\ntwo\n"
+
+    def test_large_file_keeps_whole_lines_from_the_end(self, tmp_path):
+        from scripts.explain import read_text_tail
+
+        p = tmp_path / "big.log"
+        p.write_text("".join(f"line {i}\n" for i in range(100)))
+        tail = read_text_tail(p, max_bytes=30)
+
+        assert tail.endswith("line 99\n")
+        assert tail.startswith("line ")
+        assert len(tail) <= 30
+
+
+class TestKindFromPath:
+    def test_extensions_map_to_kinds(self):
+        from scripts.explain import kind_from_path
+
+        assert kind_from_path("src/App.TSX") == "code"
+        assert kind_from_path("conf/app.yaml") == "config"
+        assert kind_from_path("README.md") == "docs"
+        assert kind_from_path("data/report.csv") == "table"
+        assert kind_from_path("build.log") is None
+        assert kind_from_path(None) is None
+
+
+class TestGuessKindFromContent:
+    def test_heuristics(self):
+        from scripts.explain import guess_kind_from_content
+
+        assert guess_kind_from_content("diff --git a/x b/x\n+1\n") == "diff"
+        assert guess_kind_from_content("\n\n{\"a\": 1}") == "config"
+        assert guess_kind_from_content("name: x\nport: 1\nhost: y\n") == "config"
+        assert guess_kind_from_content("a,b\n1,2\n") == "table"
+        assert guess_kind_from_content("ERROR boom\n" * 5000) == "logs"
+
+
+class TestBuildPrompts:
+    def test_prefix_is_identical_for_different_content(self):
+        """Only the content differs, so Ollama can reuse the cached prefix."""
+        from scripts.explain import build_prompts
+
+        sys_a, user_a = build_prompts("first log", "logs")
+        sys_b, user_b = build_prompts("second, longer log", "logs")
+
+        assert sys_a == sys_b
+        assert user_a.split("first log")[0] == user_b.split("second, longer log")[0]
+        assert user_a.endswith("first log\n```")
@@ -0,0 +1,18 @@
+# tests/unit/helper/test_colors.py
+"""Unit tests for colors.py."""
+
+from scripts.helper.colors import Colors
+
+
+def test_refresh_follows_force_color(monkeypatch):
+    monkeypatch.setenv("FORCE_COLOR", "1")
+    try:
+        assert Colors.refresh() is True
+        assert Colors.c("x") == f"{Colors.BRIGHT_CYAN}x{Colors.RESET}"
+
+        monkeypatch.delenv("FORCE_COLOR")
+        assert Colors.refresh() is False  # pytest captures stdout: not a TTY
+        assert Colors.c("x") == "x"
+    finally:
+        monkeypatch.undo()
+        Colors.refresh()
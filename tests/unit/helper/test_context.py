@@ -0,0 +1,19 @@
+# tests/unit/helper/test_context.py
+"""Unit tests for context.py sizing helpers."""
+
+from scripts.helper.context import fit_num_ctx
+
+
+class TestFitNumCtx:
+    def test_small_prompt_gets_minimum(self):
+        assert fit_num_ctx("short diff") == 2048
+
+    def test_rounds_up_to_power_of_two(self):
+        # ~4000 tokens + 512 response -> 8192
+        assert fit_num_ctx("x" * 12000) == 8192
+
+    def test_clamped_to_max(self):
+        assert fit_num_ctx("x" * 200000, max_ctx=4096) == 4096
+
+    def test_parts_are_sized_together(self):
+        assert fit_num_ctx("x" * 6000, "y" * 6000) == fit_num_ctx("x" * 12000)
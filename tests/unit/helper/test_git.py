@@ -0,0 +1,218 @@
+# tests/unit/helper/test_git.py
+"""Unit tests for git.py diff helpers."""
+
+from scripts.helper.git import analyze_diff
+
+
+SAMPLE_DIFF = """diff --git a/app.py b/app.py
+index 1111111..2222222 100644
+--- a/app.py
++++ b/app.py
+@@ -1,3 +1,3 @@
+ import os
+-print("old")
++print("new")
++print("extra")
+diff --git a/new.py b/new.py
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ b/new.py
+@@ -0,0 +1 @@
++x = 1
+"""
+
+
+class TestAnalyzeDiff:
+    def test_counts_files_and_lines(self):
+        stats = analyze_diff(SAMPLE_DIFF)
+        assert stats.file_count == 2
+        assert stats.files == ["app.py", "new.py"]
+        assert stats.added == 3
+        assert stats.removed == 1
+
+    def test_detects_new_files(self):
+        stats = analyze_diff(SAMPLE_DIFF)
+        assert stats.new_files == ["new.py"]
+
+    def test_empty_diff(self):
+        stats = analyze_diff("")
+        assert stats.file_count == 0
+        assert stats.files == []
+
+
+class TestReadGitDiff:
+    def _repo(self, tmp_path):
+        import subprocess
+
+        def git(*args):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-q")
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text("line\n" * 50)
+        git("add", ".")
+        return tmp_path
+
+    def test_reads_full_diff_without_limit(self, tmp_path):
+        from scripts.helper.git import read_git_diff
+
+        repo = self._repo(tmp_path)
+        diff = read_git_diff(["diff", "--cached"], str(repo))
+        assert diff.count("diff --git ") == 2
+        assert "truncated" not in diff
+
+    def test_truncates_at_file_boundary(self, tmp_path):
+        from scripts.helper.git import read_git_diff
+
+        repo = self._repo(tmp_path)
+        full = read_git_diff(["diff", "--cached"], str(repo))
+        diff = read_git_diff(["diff", "--cached"], str(repo), max_chars=len(full) - 10)
+        assert diff.count("diff --git ") == 1
+        assert diff.endswith("... (diff truncated)\n")
+
+    def test_oversized_first_file_is_cut_at_line_end(self, tmp_path):
+        from scripts.helper.git import read_git_diff
+
+        repo = self._repo(tmp_path)
+        diff = read_git_diff(["diff", "--cached"], str(repo), max_chars=200)
+        body, _, _ = diff.partition("\n... (diff truncated)")
+        assert len(body) < 200
+        assert body.endswith("\n")
+
+    def test_git_failure_exits(self, tmp_path):
+        import pytest
+        from scripts.helper.git import read_git_diff
+
+        with pytest.raises(SystemExit):
+            read_git_diff(["diff", "--cached"], str(tmp_path / "missing"))
+
+    def test_large_stderr_does_not_block_stdout(self, tmp_path, monkeypatch):
+        """More stderr than a pipe buffer holds, written before any stdout."""
+        import os
+        import stat
+        from scripts.helper import git
+
+        fake = tmp_path / "git"
+        fake.write_text(
+            "#!/bin/sh\n"
+            "i=0; while [ $i -lt 4000 ]; do echo 'warning: CRLF will be replaced by LF' >&2; i=$((i+1)); done\n"
+            "echo 'diff --git a/x b/x'\n"
+        )
+        fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setattr(git, "_GIT_ENV", {**git._GIT_ENV, "PATH": f"{tmp_path}{os.pathsep}{os.environ['PATH']}"})
+
+        assert git.read_git_diff(["diff"], str(tmp_path)) == "diff --git a/x b/x\n"
+
+
+class TestGetGitDiff:
+    def _repo(self, tmp_path, names):
+        import subprocess
+
+        subprocess.run(["git", "-C", str(tmp_path), "init", "-q"], check=True)
+        for name in names:
+            (tmp_path / name).write_text("content\n")
+        subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+        return str(tmp_path)
+
+    def test_excluded_paths_are_filtered(self, tmp_path):
+        from scripts.helper.git import get_git_diff
+
+        cwd = self._repo(tmp_path, ["app.py", "poetry.lock"])
+        diff = get_git_diff(False, cwd, exclude=["*.lock"])
+        assert "app.py" in diff
+        assert "poetry.lock" not in diff
+
+    def test_only_excluded_changes_are_kept(self, tmp_path):
+        from scripts.helper.git import get_git_diff
+
+        cwd = self._repo(tmp_path, ["poetry.lock"])
+        diff = get_git_diff(False, cwd, exclude=["*.lock"])
+        assert "poetry.lock" in diff
+
+
+class TestGitStatus:
+    def test_reports_branch_and_changed_paths(self, tmp_path):
+        import subprocess
+        from scripts.helper.git import git_status, has_upstream
+
+        def git(*args):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+        git("init", "-q", "-b", "main")
+        (tmp_path / "old name.txt").write_text("one\n")
+        (tmp_path / "edited.txt").write_text("one\n")
+        git("add", ".")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init")
+        git("mv", "old name.txt", "new name.txt")
+        (tmp_path / "edited.txt").write_text("two\n")
+        (tmp_path / "untracked.txt").write_text("x\n")
+
+        status = git_status(str(tmp_path))
+        assert status.branch == "main"
+        assert status.upstream is None
+        assert status.staged == ["new name.txt"]
+        assert status.unstaged == ["edited.txt"]
+        assert not has_upstream(str(tmp_path), status)
+
+    def test_parses_rename_and_unmerged_records(self):
+        import subprocess
+        from unittest.mock import patch
+        from scripts.helper.git import git_status
+
+        h = "0" * 40
+        out = "\0".join([
+            "# branch.head main",
+            f"2 R. N... 100644 100644 100644 {h} {h} R100 new name.txt",
+            "old name.txt",
+            f"u UU N... 100644 100644 100644 100644 {h} {h} {h} conflict file.txt",
+            f"1 .M N... 100644 100644 100644 {h} {h} edited.txt",
+            "",
+        ])
+        res = subprocess.CompletedProcess([], 0, stdout=out, stderr="")
+        with patch("scripts.helper.git.run_git_cmd", return_value=res):
+            status = git_status("/repo")
+
+        assert status.staged == ["new name.txt", "conflict file.txt"]
+        assert status.unstaged == ["conflict file.txt", "edited.txt"]
+
+    def test_unstaged_changes_are_diffed_when_nothing_is_staged(self, tmp_path):
+        import subprocess
+        from scripts.helper.git import get_git_diff
+
+        subprocess.run(["git", "-C", str(tmp_path), "init", "-q"], check=True)
+        (tmp_path / "a.txt").write_text("one\n")
+        subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+        subprocess.run(
+            ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init"],
+            check=True,
+        )
+        (tmp_path / "a.txt").write_text("two\n")
+        assert "+two" in get_git_diff(False, str(tmp_path))
+
+
+class TestCompactDiff:
+    def test_caps_only_oversized_files(self):
+        from scripts.helper.git import compact_diff
+
+        big = "diff --git a/big.py b/big.py\n" + "+x\n" * 50
+        small = "diff --git a/small.py b/small.py\n+y\n"
+        out = compact_diff(big + small, per_file_lines=10)
+
+        assert "... (41 lines elided)\n" in out
+        assert out.endswith(small)
+        assert out.count("+x\n") == 9
+
+    def test_context_lines_are_dropped_first(self):
+        from scripts.helper.git import compact_diff
+
+        section = "diff --git a/a.py b/a.py\n@@ -1,20 +1,20 @@\n" + " ctx\n" * 20 + "-old\n+new\n"
+        out = compact_diff(section, per_file_lines=10)
+
+        assert out == "diff --git a/a.py b/a.py\n@@ -1,20 +1,20 @@\n-old\n+new\n... (20 lines elided)\n"
+
+    def test_small_diff_is_returned_as_is(self):
+        from scripts.helper.git import compact_diff
+
+        diff = "diff --git a/a.py b/a.py\n+x\n"
+        assert compact_diff(diff, per_file_lines=10) is diff
@@ -2,7 +2,7 @@
 """Unit tests for json_utils.py."""
 
 from pydantic import BaseModel
-from scripts.helper.json_utils import extract_json_object, safe_parse_model, strip_json_fence
+from scripts.helper.json_utils import JsonObjectScanner, extract_json_object, safe_parse_model, strip_json_fence
 
 
 class MyModel(BaseModel):
@@ -23,6 +23,21 @@ class TestExtractJsonObject:
         raw = "Just text"
         assert extract_json_object(raw) == "Just text"
 
+    def test_stops_at_first_balanced_object(self):
+        raw = 'Sure: {"name": "a}b"} and also {"name": "c"}'
+        assert extract_json_object(raw) == '{"name": "a}b"}'
+
+
+class TestJsonObjectScanner:
+    def test_end_offset_across_chunks(self):
+        scanner = JsonObjectScanner()
+        assert scanner.feed('noise {"a": "x\\"}') == -1
+        assert scanner.feed('", "b": 1} tail') == len('", "b": 1}')
+
+    def test_quotes_before_object_are_ignored(self):
+        scanner = JsonObjectScanner()
+        assert scanner.feed('it"s {"a": 1} x') == len('it"s {"a": 1}')
+
 
 class TestSafeParseModel:
     def test_valid_parsing(self):
@@ -42,3 +57,13 @@ class TestSafeParseModel:
         result = safe_parse_model(raw, MyModel, lambda r: MyModel(name="schema-error", value=-2))
         assert result.name == "schema-error"
         assert result.value == -2
+
+    def test_truncated_object_is_salvaged(self):
+        raw = '{"value": 7, "name": "kept", "extra": "cut off mid-str'
+        result = safe_parse_model(raw, MyModel, lambda r: MyModel(name="flbk", value=0))
+        assert (result.name, result.value) == ("kept", 7)
+
+    def test_truncated_required_field_falls_back(self):
+        raw = '{"value": 7, "name": "half-writ'
+        result = safe_parse_model(raw, MyModel, lambda r: MyModel(name="flbk", value=0))
+        assert result.name == "flbk"
@@ -0,0 +1,22 @@
+# tests/unit/helper/test_keys.py
+"""Unit tests for keys.py single-key input."""
+
+from unittest.mock import patch
+
+
+def test_read_key_falls_back_to_input_without_tty():
+    """Piped stdin should use input() and strip the line."""
+    from scripts.helper.keys import read_key
+
+    with patch("sys.stdin.isatty", return_value=False), patch("builtins.input", return_value=" 3 \n"):
+        assert read_key("> ") == "3"
+
+
+def test_read_key_maps_enter_to_default():
+    """Enter on a terminal should return "" (the menu default)."""
+    from scripts.helper import keys
+
+    with patch("sys.stdin.isatty", return_value=True), \
+         patch("sys.stdout.isatty", return_value=True), \
+         patch.object(keys, "_getch", return_value="\r"):
+        assert keys.read_key("> ") == ""
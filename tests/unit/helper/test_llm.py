@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock
 from scripts.helper.llm import ollama_chat
 
 
-@patch("scripts.helper.llm.requests.post")
+@patch("scripts.helper.llm._SESSION.post")
 def test_ollama_chat_sends_options_correctly(mock_post):
     """Verify that num_ctx, temperature, and top_p are sent inside 'options'."""
     
@@ -41,3 +41,69 @@ def test_ollama_chat_sends_options_correctly(mock_post):
     assert "num_ctx" not in payload
     assert "temperature" not in payload
     assert "top_p" not in payload
+
+
+@patch("scripts.helper.llm._SESSION.post")
+def test_ollama_chat_stream_joins_chunks(mock_post):
+    """Verify that stream=True consumes NDJSON chunks and stops at 'done'."""
+    lines = [
+        json.dumps({"message": {"content": "Hel"}, "done": False}).encode(),
+        b"",
+        json.dumps({"message": {"content": "lo"}, "done": False}).encode(),
+        json.dumps({"message": {"content": ""}, "done": True}).encode(),
+        json.dumps({"message": {"content": "ignored"}, "done": False}).encode(),
+    ]
+    mock_resp = MagicMock()
+    mock_resp.iter_lines.return_value = iter(lines)
+    mock_resp.raise_for_status = MagicMock()
+    mock_post.return_value = mock_resp
+
+    out = ollama_chat(system_prompt="sys", user_prompt="user", stream=True)
+
+    assert out == "Hello"
+    kwargs = mock_post.call_args.kwargs
+    assert kwargs["json"]["stream"] is True
+    assert kwargs["stream"] is True
+    mock_resp.close.assert_called_once()
+
+
+@patch("scripts.helper.llm._SESSION.post")
+def test_stream_stops_after_first_json_object(mock_post):
+    """stop_after_json should hang up once the top-level object closes."""
+    from scripts.helper.llm import ollama_generate
+
+    lines = [
+        json.dumps({"response": '{"a": "}{", ', "done": False}).encode(),
+        json.dumps({"response": '"b": {"c": 1}} trailing', "done": False}).encode(),
+        json.dumps({"response": " never read", "done": False}).encode(),
+    ]
+    mock_resp = MagicMock()
+    mock_resp.iter_lines.return_value = iter(lines)
+    mock_resp.raise_for_status = MagicMock()
+    mock_post.return_value = mock_resp
+
+    out = ollama_generate(system_prompt="sys", user_prompt="user", stream=True, stop_after_json=True)
+
+    assert out == '{"a": "}{", "b": {"c": 1}}'
+    mock_resp.close.assert_called_once()
+
+
+@patch("scripts.helper.llm._SESSION.post")
+def test_ollama_generate_sends_system_and_prompt(mock_post):
+    """Verify that ollama_generate posts a single-turn payload to /api/generate."""
+    from scripts.helper.llm import ollama_generate
+
+    mock_resp = MagicMock()
+    mock_resp.json.return_value = {"response": "ok", "done": True}
+    mock_resp.raise_for_status = MagicMock()
+    mock_post.return_value = mock_resp
+
+    out = ollama_generate(system_prompt="sys", user_prompt="user", num_ctx=1024)
+
+    assert out == "ok"
+    assert mock_post.call_args.args[0].endswith("/api/generate")
+    payload = mock_post.call_args.kwargs["json"]
+    assert payload["system"] == "sys"
+    assert payload["prompt"] == "user"
+    assert "messages" not in payload
+    assert payload["options"]["num_ctx"] == 1024
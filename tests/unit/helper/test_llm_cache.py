@@ -0,0 +1,106 @@
+# tests/unit/helper/test_llm_cache.py
+"""Unit tests for llm_cache.py (SQLite-backed exact-match cache)."""
+
+import sqlite3
+from unittest.mock import patch
+
+from scripts.helper import llm_cache
+
+
+def test_store_then_lookup_roundtrip():
+    key = llm_cache.cache_key("tool", "system", "user", "model")
+    assert llm_cache.lookup(key) is None
+
+    llm_cache.store(key, '{"summary": "x"}', "model")
+
+    assert llm_cache.lookup(key) == '{"summary": "x"}'
+
+
+def test_key_depends_on_every_part():
+    assert llm_cache.cache_key("a", "bc") != llm_cache.cache_key("ab", "c")
+
+
+def test_key_is_128_bit_hex_without_blake3(monkeypatch):
+    monkeypatch.setattr("scripts.helper.llm_cache._blake3", None)
+    key = llm_cache.cache_key("tool", "prompt")
+    assert len(key) == 32
+    int(key, 16)
+
+
+def test_expired_entries_are_misses():
+    key = llm_cache.cache_key("old")
+    with patch("scripts.helper.llm_cache.time.time", return_value=1000):
+        llm_cache.store(key, "stale")
+    with patch("scripts.helper.llm_cache.time.time", return_value=1000 + 61):
+        assert llm_cache.lookup(key, max_age=60) is None
+        assert llm_cache.lookup(key) == "stale"
+
+
+def test_disabled_cache_is_bypassed(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    key = llm_cache.cache_key("off")
+    llm_cache.store(key, "value")
+    assert llm_cache.lookup(key) is None
+
+
+def test_recent_entries_are_kept_in_lru_order(monkeypatch):
+    monkeypatch.setattr("scripts.helper.llm_cache._MEMO_SIZE", 2)
+    for name in ("a", "b"):
+        llm_cache.store(name, name.upper())
+    llm_cache.lookup("a")  # "a" becomes most recent
+    llm_cache.store("c", "C")
+
+    assert list(llm_cache._memo) == ["a", "c"]
+    # Evicted from memory only: the SQLite entry still answers
+    assert llm_cache.lookup("b") == "B"
+
+
+def test_entries_survive_a_new_connection(monkeypatch):
+    """Write-through: a fresh process (new connection, empty LRU) still hits."""
+    key = llm_cache.cache_key("persist")
+    llm_cache.store(key, "kept")
+    monkeypatch.setattr("scripts.helper.llm_cache._conn", None)
+    llm_cache._memo.clear()
+
+    assert llm_cache.lookup(key) == "kept"
+    mode = llm_cache._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_least_hit_entries_are_evicted_past_the_cap(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MAX_ENTRIES", "4")
+    for i, name in enumerate("abcd"):
+        with patch("scripts.helper.llm_cache.time.time", return_value=1000 + i):
+            llm_cache.store(name, name.upper())
+    llm_cache._memo.clear()
+    llm_cache.lookup("a")  # oldest, but reused: kept
+
+    llm_cache.store("e", "E")
+
+    conn = llm_cache._connection()
+    keys = {key for (key,) in conn.execute("SELECT key FROM llm_cache")}
+    assert keys == {"a", "c", "d", "e"}
+    assert "b" not in llm_cache._memo
+    assert conn.execute("SELECT hits FROM llm_cache WHERE key = 'a'").fetchone()[0] == 1
+
+
+def test_old_cache_file_gains_hits_column(tmp_path, monkeypatch):
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE llm_cache (key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, ts INTEGER NOT NULL)")
+    conn.execute("INSERT INTO llm_cache VALUES ('k', 'm', 'v', 1)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr("scripts.helper.llm_cache.CACHE_PATH", path)
+
+    assert llm_cache.lookup("k") == "v"
+
+
+def test_memo_hits_are_counted_on_the_next_write():
+    llm_cache.store("hot", "H")
+    for _ in range(3):
+        assert llm_cache.lookup("hot") == "H"  # served from the in-process LRU
+    llm_cache.store("other", "O")
+
+    conn = llm_cache._connection()
+    assert conn.execute("SELECT hits FROM llm_cache WHERE key = 'hot'").fetchone()[0] == 3
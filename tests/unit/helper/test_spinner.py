@@ -0,0 +1,51 @@
+# tests/unit/helper/test_spinner.py
+"""Unit tests for spinner.py."""
+
+import os
+import signal
+
+
+class _ReentrancyCheckingStderr:
+    """Stand-in for sys.stderr that fails like a BufferedWriter on re-entry."""
+
+    def __init__(self):
+        self.busy = False
+        self.tick_inside_write = False
+        self.text = ""
+
+    def write(self, s: str) -> int:
+        if self.busy:
+            raise RuntimeError("reentrant call inside stderr.write")
+        self.busy = True
+        try:
+            if self.tick_inside_write:
+                # Deliver a tick while this write is in progress
+                os.kill(os.getpid(), signal.SIGALRM)
+                for _ in range(1000):
+                    pass
+            self.text += s
+        finally:
+            self.busy = False
+        return len(s)
+
+    def flush(self) -> None:
+        pass
+
+
+def test_fn_can_write_to_stderr_while_spinning(monkeypatch):
+    """A tick landing inside fn()'s own stderr write must not re-enter sys.stderr."""
+    from scripts.helper.spinner import with_spinner
+
+    fake = _ReentrancyCheckingStderr()
+    monkeypatch.setattr("sys.stderr", fake)
+
+    def noisy(msg: str) -> str:
+        fake.tick_inside_write = True
+        try:
+            fake.write(msg)
+        finally:
+            fake.tick_inside_write = False
+        return msg
+
+    assert with_spinner("test", noisy, "working\n") == "working\n"
+    assert fake.text.startswith("working\n")
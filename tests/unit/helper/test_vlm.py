@@ -9,7 +9,7 @@ from scripts.helper.vlm import ollama_chat_with_images
 
 
 @patch("scripts.helper.vlm._prepare_images_for_vlm")
-@patch("scripts.helper.vlm.requests.post")
+@patch("scripts.helper.vlm._SESSION.post")
 def test_vlm_sends_options_correctly(mock_post, mock_prep):
     """Verify that VLM helper puts num_ctx, etc. into options."""
     